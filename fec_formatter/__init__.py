@@ -1,10 +1,33 @@
 """FEC Formatter package.
 
-Provides a CLI to transform FEC CSV exports into XLSX with custom columns.
+Provides a CLI to transform FEC CSV exports into XLSX with custom columns,
+and a streaming Python API (see ``fec_formatter.pipeline``) for embedding the
+same pipeline in-process.
 """
 
+from .pipeline import (
+    FilterSpec,
+    FormatPipeline,
+    PipelineError,
+    RowStream,
+    build_rows,
+    filter_rows,
+    open_source,
+    sort_rows,
+    write_rows,
+)
+
 __all__ = [
     "__version__",
+    "FilterSpec",
+    "FormatPipeline",
+    "PipelineError",
+    "RowStream",
+    "build_rows",
+    "filter_rows",
+    "open_source",
+    "sort_rows",
+    "write_rows",
 ]
 
 __version__ = "0.1.0"
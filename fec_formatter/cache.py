@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3
+CACHE_DIR_ENV = "FEC_TOOLS_CACHE_DIR"
+_HASH_CHUNK = 1024 * 1024
+_HASH_MEMO_NAME = "content-hashes.json"
+_HASH_MEMO_LIMIT = 1000
+_STREAM_BUFFER = 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "fec-tools"
+
+
+@dataclass(frozen=True)
+class FileHash:
+    """SHA-256 of a file together with the path, size and mtime it was taken at."""
+
+    memo_key: str
+    sha256: str
+
+
+def _memo_key(path: Path) -> str:
+    st = path.stat()
+    return f"{path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+
+
+class HashingReader(io.RawIOBase):
+    """Binary reader that hashes a file's bytes as another consumer reads them.
+
+    Lets a streaming pass produce the content hash without a second read of
+    the file; ``result`` is only meaningful once the file was read to EOF.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._memo_key = _memo_key(path)
+        self._file = path.open("rb")
+        self._digest = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        n = self._file.readinto(buffer)
+        if n:
+            self._digest.update(memoryview(buffer)[:n])
+        return n
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+    def open_text(self, encoding: str, newline: Optional[str] = None, errors: Optional[str] = None) -> IO[str]:
+        return io.TextIOWrapper(io.BufferedReader(self, _STREAM_BUFFER), encoding=encoding, errors=errors, newline=newline)
+
+    def result(self) -> FileHash:
+        return FileHash(self._memo_key, self._digest.hexdigest())
+
+
+@dataclass
+class OutputCache:
+    """Content-addressed store of rendered outputs with size-bounded LRU eviction.
+
+    Entries are named by a hash of everything that determines the output.
+    A hit copies the stored artifact to the requested path, so later edits
+    to that file cannot reach the entry; every hit refreshes the entry's
+    mtime, which is the recency used for eviction.
+    """
+
+    directory: Path
+    max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+
+    def content_hash(self, path: Path) -> str:
+        """SHA-256 of a file, memoized by path, size and mtime."""
+        known = self.known_hash(path)
+        if known:
+            return known
+        reader = HashingReader(path)
+        with reader:
+            while reader.read(_HASH_CHUNK):
+                pass
+        result = reader.result()
+        self.remember(result)
+        return result.sha256
+
+    def known_hash(self, path: Path) -> Optional[str]:
+        """The memoized SHA-256 for the file's current path, size and mtime, without reading it."""
+        return self._load_memo().get(_memo_key(path))
+
+    def remember(self, file_hash: FileHash) -> None:
+        memo = self._load_memo()
+        memo.pop(file_hash.memo_key, None)
+        memo[file_hash.memo_key] = file_hash.sha256
+        self._save_memo(dict(list(memo.items())[-_HASH_MEMO_LIMIT:]))
+
+    def key(self, parts: Dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str, output_path: Path) -> Optional[Dict[str, Any]]:
+        """Materialize a cached artifact at ``output_path``; return its metadata on a hit."""
+        entry = self._entry(key, output_path.suffix)
+        meta_path = self._meta(key)
+        if not entry.exists() or not meta_path.exists():
+            return None
+        try:
+            with meta_path.open("r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(output_path.name + ".cache-tmp")
+        if temp_path.exists():
+            temp_path.unlink()
+        shutil.copyfile(entry, temp_path)
+        os.replace(temp_path, output_path)
+        os.utime(entry)
+        return meta
+
+    def store(self, key: str, artifact: Path, meta: Dict[str, Any]) -> None:
+        # Copy rather than link so later writes to the artifact cannot alter the entry
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(key, artifact.suffix)
+        temp_path = entry.with_name(entry.name + ".tmp")
+        shutil.copyfile(artifact, temp_path)
+        os.replace(temp_path, entry)
+        with self._meta(key).open("w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        self.evict()
+
+    def evict(self) -> None:
+        entries: List[os.stat_result] = []
+        paths: List[Path] = []
+        for p in self.directory.iterdir():
+            if p.name == _HASH_MEMO_NAME or p.suffix in (".json", ".tmp"):
+                continue
+            paths.append(p)
+            entries.append(p.stat())
+        total = sum(st.st_size for st in entries)
+        for st, p in sorted(zip(entries, paths), key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            total -= st.st_size
+            for victim in (p, self._meta(p.stem)):
+                try:
+                    victim.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _entry(self, key: str, suffix: str) -> Path:
+        return self.directory / f"{key}{suffix}"
+
+    def _meta(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load_memo(self) -> Dict[str, str]:
+        try:
+            with (self.directory / _HASH_MEMO_NAME).open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_memo(self, memo: Dict[str, str]) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self.directory / (_HASH_MEMO_NAME + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(memo, f)
+        os.replace(temp_path, self.directory / _HASH_MEMO_NAME)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .services import TypedRow, typed_row_sort_key
+
+
+DEFAULT_CHECKPOINT_EVERY = 100_000
+
+
+class CheckpointError(Exception):
+    pass
+
+
+def checkpoint_path_for(output_path: Path) -> Path:
+    return output_path.with_suffix(output_path.suffix + ".ckpt")
+
+
+def fingerprint_inputs(paths: Sequence[Path]) -> List[Dict[str, Any]]:
+    """Describe input files so a resume can detect that they changed."""
+    entries: List[Dict[str, Any]] = []
+    for p in paths:
+        st = p.stat()
+        entries.append({"path": str(p), "size": st.st_size, "mtime_ns": st.st_mtime_ns})
+    return entries
+
+
+@dataclass
+class CheckpointStore:
+    path: Path
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        try:
+            with self.path.open("r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as exc:
+            raise CheckpointError(f"Unreadable checkpoint file: {self.path}") from exc
+
+    def save(self, state: Dict[str, Any]) -> None:
+        # Write-then-rename so a crash mid-save leaves the previous state intact
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+    def load_matching(self, kind: str, inputs: List[Dict[str, Any]], **expected: Any) -> Optional[Dict[str, Any]]:
+        """Load the state and verify it belongs to this exact run, or return None."""
+        state = self.load()
+        if state is None:
+            return None
+        if state.get("kind") != kind or state.get("inputs") != inputs:
+            raise CheckpointError(
+                f"Checkpoint {self.path} does not match the current inputs; remove it to start over"
+            )
+        for key, value in expected.items():
+            if state.get(key) != value:
+                raise CheckpointError(
+                    f"Checkpoint {self.path} was recorded with a different '{key}'; remove it to start over"
+                )
+        return state
+
+
+@dataclass
+class SortedRunStore:
+    """Spills sorted runs of typed rows to disk and merges them back in order.
+
+    Every row carries its global sequence number so that merging the runs
+    yields exactly the order a stable in-memory sort would have produced.
+    """
+
+    directory: Path
+
+    def write_run(self, index: int, rows: List[Tuple[int, TypedRow]]) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rows.sort(key=lambda item: typed_row_sort_key(item[1], item[0]))
+        name = f"run-{index:06d}.jsonl"
+        with (self.directory / name).open("w", encoding="utf-8") as f:
+            for seq, (values, link, dt) in rows:
+                f.write(json.dumps([seq, values, link, dt.isoformat() if dt else None]))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return name
+
+    def _iter_run(self, name: str) -> Iterator[Tuple[int, TypedRow]]:
+        with (self.directory / name).open("r", encoding="utf-8") as f:
+            for line in f:
+                seq, values, link, dt_raw = json.loads(line)
+                dt = datetime.fromisoformat(dt_raw) if dt_raw else None
+                yield seq, (values, link, dt)
+
+    def iter_merged(self, names: Sequence[str]) -> Iterator[TypedRow]:
+        streams = [self._iter_run(n) for n in names]
+        merged = heapq.merge(*streams, key=lambda item: typed_row_sort_key(item[1], item[0]))
+        for _seq, row in merged:
+            yield row
+
+    def check(self, names: Sequence[str]) -> None:
+        missing = [n for n in names if not (self.directory / n).exists()]
+        if missing:
+            raise CheckpointError(f"Checkpoint runs missing from {self.directory}: {', '.join(missing)}")
+
+    def clear(self) -> None:
+        if not self.directory.exists():
+            return
+        for child in self.directory.iterdir():
+            try:
+                child.unlink()
+            except OSError:
+                pass
+        try:
+            self.directory.rmdir()
+        except OSError:
+            pass
@@ -1,19 +1,47 @@
 from __future__ import annotations
 
 import argparse
-import csv
-from dataclasses import dataclass
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
-from functools import cmp_to_key
-from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from functools import partial
+from itertools import chain
 
+from . import __version__
+from .cache import CACHE_DIR_ENV, DEFAULT_CACHE_MAX_BYTES, FileHash, HashingReader, OutputCache, default_cache_dir
 from .container import Container
 from .services import FECRowBuilder, XLSXWriterService
-from .combiner import CSVCombinerService
-
-
-from .services import OUTPUT_COLUMNS, _parse_date
+from .combiner import CSVCombineError, CSVCombinerService
+from .profiler import CSVProfilerService, DatasetProfile, ProfileError
+from .partitioner import ELECTION_CYCLE, CSVPartitionError, CSVPartitionerService
+from .checkpoint import (
+    DEFAULT_CHECKPOINT_EVERY,
+    CheckpointError,
+    CheckpointStore,
+    SortedRunStore,
+    checkpoint_path_for,
+    fingerprint_inputs,
+)
+from .enrichment import EnrichmentError, MasterFileEnricher
+from .pipeline import FilterSpec, FormatPipeline, PipelineError, RowBuildFn, build_rows, sort_rows
+from .readers import (
+    INPUT_FORMAT_BULK,
+    INPUT_FORMAT_CSV,
+    INPUT_FORMATS,
+    BulkFormatError,
+    BulkLayout,
+    iter_bulk_rows_with_offsets,
+    iter_csv_rows_with_offsets,
+    map_bulk_lines,
+    read_bulk_header,
+)
+from .sampling import SampleResult, sample_matching_rows
+from .server import DEFAULT_HOST, DEFAULT_PORT, FECServer, ServeError
+
+
+from .services import TypedRow, _norm
 
 
 @dataclass
@@ -22,6 +50,24 @@ class Args:
     contributor_names: Sequence[str]
     contributor_ids: Sequence[str]
     output_path: Path
+    checkpoint: bool = False
+    resume: bool = False
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY
+    sample: Optional[int] = None
+    sample_seed: Optional[int] = None
+    sample_max_bytes: Optional[int] = None
+    sample_max_seconds: Optional[float] = None
+    input_format: str = INPUT_FORMAT_CSV
+    bulk_header_file: Optional[Path] = None
+    committee_master: Optional[Path] = None
+    candidate_master: Optional[Path] = None
+    no_cache: bool = False
+    cache_dir: Optional[Path] = None
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    input_files: Sequence[Path] = ()
+    input_dir: Optional[Path] = None
+    pattern: str = "*.csv"
+    workers: int = 1
 
 
 def parse_args(argv: Optional[Sequence[str]] = None) -> Args:
@@ -30,7 +76,22 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> Args:
 
     # format-xlsx
     p_fmt = sub.add_parser("format-xlsx", help="Format a FEC CSV into styled XLSX")
-    p_fmt.add_argument("--input-file", type=Path, required=True, help="Source FEC CSV file")
+    p_fmt.add_argument(
+        "--input-file",
+        dest="input_files",
+        type=Path,
+        action="append",
+        default=[],
+        help="Source FEC CSV (or bulk) file; can be passed multiple times to format several files as one",
+    )
+    p_fmt.add_argument("--input-dir", type=Path, default=None, help="Also read every file in this directory matching --pattern")
+    p_fmt.add_argument("--pattern", type=str, default="*.csv", help="Glob pattern for --input-dir (default: *.csv)")
+    p_fmt.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Filter and build rows of multiple input files in parallel processes (default: 1)",
+    )
     p_fmt.add_argument(
         "--contributor-name",
         dest="contributor_names",
@@ -65,27 +126,295 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> Args:
         default=Path("output/fec_formatted.xlsx"),
         help="Output XLSX path (default: output/fec_formatted.xlsx)",
     )
+    _add_checkpoint_arguments(p_fmt)
+    p_fmt.add_argument("--no-cache", action="store_true", help="Always re-render; neither read nor update the output cache")
+    p_fmt.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=f"Output cache directory (default: ${CACHE_DIR_ENV} or ~/.cache/fec-tools)",
+    )
+    p_fmt.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES,
+        help="Evict least recently used cache entries beyond this total size (default: 2 GiB)",
+    )
+    _add_input_format_arguments(p_fmt)
+    p_fmt.add_argument(
+        "--committee-master",
+        type=Path,
+        default=None,
+        help="FEC committee master (cm.txt); adds Committee Type and Committee Party columns",
+    )
+    p_fmt.add_argument(
+        "--candidate-master",
+        type=Path,
+        default=None,
+        help="FEC candidate master (cn.txt); with --committee-master adds Candidate and Candidate Party columns",
+    )
+    p_fmt.add_argument(
+        "--sample",
+        type=int,
+        default=None,
+        help="Preview mode: write a uniform random sample of N matching rows and report the match count",
+    )
+    p_fmt.add_argument("--sample-seed", type=int, default=None, help="Random seed for --sample (reproducible previews)")
+    p_fmt.add_argument(
+        "--sample-max-bytes",
+        type=int,
+        default=None,
+        help="With --sample, stop after reading this many input bytes and estimate the match count",
+    )
+    p_fmt.add_argument(
+        "--sample-max-seconds",
+        type=float,
+        default=None,
+        help="With --sample, stop after this many seconds and estimate the match count",
+    )
     # combine
     p_comb = sub.add_parser("combine", help="Combine CSV files from a directory")
-    p_comb.add_argument("--input-dir", type=Path, required=True, help="Directory containing CSV files")
+    p_comb.add_argument("--input-dir", type=Path, required=True, help="Directory containing CSV (or bulk) files")
     p_comb.add_argument("--pattern", type=str, default="*.csv", help="Glob pattern (default: *.csv)")
     p_comb.add_argument("--output", type=Path, required=True, help="Output combined CSV path")
     p_comb.add_argument("--overwrite", action="store_true", help="Allow overwriting output")
+    p_comb.add_argument(
+        "--union-schema",
+        action="store_true",
+        help="Combine files with differing headers under the union of their columns",
+    )
+    _add_checkpoint_arguments(p_comb)
+    _add_input_format_arguments(p_comb)
+    # profile
+    p_prof = sub.add_parser("profile", help="Profile columns of one or more CSVs in a single streaming pass")
+    _add_profile_arguments(p_prof)
+    # partition
+    p_part = sub.add_parser("partition", help="Split a CSV into one file per key value in a single pass")
+    _add_partition_arguments(p_part)
+    # serve
+    p_serve = sub.add_parser("serve", help="Keep datasets in memory and answer filter/format requests over HTTP")
+    _add_serve_arguments(p_serve)
 
     ns = parser.parse_args(argv)
     # For uniformity, we still return Args for format-xlsx; combine handled in main()
     contrib_names = tuple(getattr(ns, "contributor_names", []) or [])
     contrib_name_contains = tuple(getattr(ns, "contributor_name_contains", []) or [])
     contrib_ids = tuple(getattr(ns, "contributor_ids", []) or [])
-    input_file = getattr(ns, "input_file", None) or Path("")
+    input_files = tuple(getattr(ns, "input_files", []) or [])
+    input_file = getattr(ns, "input_file", None) or (input_files[0] if input_files else Path(""))
     output = getattr(ns, "output", None) or Path("output/out.csv")
     # Pack contains list back into Args via a dynamic attribute on the namespace we return alongside Args
-    args = Args(input_file=input_file, contributor_names=contrib_names, contributor_ids=contrib_ids, output_path=output)
+    args = Args(
+        input_file=input_file,
+        contributor_names=contrib_names,
+        contributor_ids=contrib_ids,
+        output_path=output,
+        checkpoint=bool(getattr(ns, "checkpoint", False)),
+        resume=bool(getattr(ns, "resume", False)),
+        checkpoint_every=getattr(ns, "checkpoint_every", DEFAULT_CHECKPOINT_EVERY),
+        sample=getattr(ns, "sample", None),
+        sample_seed=getattr(ns, "sample_seed", None),
+        sample_max_bytes=getattr(ns, "sample_max_bytes", None),
+        sample_max_seconds=getattr(ns, "sample_max_seconds", None),
+        input_format=getattr(ns, "input_format", INPUT_FORMAT_CSV),
+        bulk_header_file=getattr(ns, "bulk_header_file", None),
+        committee_master=getattr(ns, "committee_master", None),
+        candidate_master=getattr(ns, "candidate_master", None),
+        no_cache=bool(getattr(ns, "no_cache", False)),
+        cache_dir=getattr(ns, "cache_dir", None),
+        cache_max_bytes=getattr(ns, "cache_max_bytes", DEFAULT_CACHE_MAX_BYTES),
+        input_files=input_files,
+        input_dir=getattr(ns, "input_dir", None),
+        pattern=getattr(ns, "pattern", "*.csv"),
+        workers=getattr(ns, "workers", 1),
+    )
     # Attach for use in run_format
     setattr(args, "contributor_name_contains", contrib_name_contains)
     return args
 
 
+def _add_checkpoint_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Periodically record progress in a sidecar '.ckpt' file so an interrupted run can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue from the last checkpoint of an interrupted run (implies --checkpoint)",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=DEFAULT_CHECKPOINT_EVERY,
+        help=f"Rows between checkpoints (default: {DEFAULT_CHECKPOINT_EVERY})",
+    )
+
+
+def _add_input_format_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default=INPUT_FORMAT_CSV,
+        help="Input file format: comma CSV with a header row (default) or headerless pipe-delimited FEC bulk files",
+    )
+    parser.add_argument(
+        "--bulk-header-file",
+        type=Path,
+        default=None,
+        help="FEC header file giving the column names of --input-format fec-bulk inputs",
+    )
+
+
+def _bulk_layout(input_format: str, bulk_header_file: Optional[Path]) -> Optional[BulkLayout]:
+    if input_format != INPUT_FORMAT_BULK:
+        return None
+    if bulk_header_file is None:
+        raise SystemExit("[ERROR] --bulk-header-file is required with --input-format fec-bulk")
+    try:
+        return BulkLayout(read_bulk_header(bulk_header_file))
+    except (BulkFormatError, OSError) as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+
+
+def _open_with_offsets(args: Args, layout: Optional[BulkLayout], start_offset: Optional[int] = None) -> Tuple[List[str], int, Iterator[Tuple[List[str], int]]]:
+    """Return ``(header, data_offset, records)`` for offset-tracking readers.
+
+    ``data_offset`` is where the data rows begin; ``records`` starts there, or
+    at ``start_offset`` when resuming.
+    """
+    if layout is not None:
+        offset = start_offset or 0
+        return layout.header, 0, iter_bulk_rows_with_offsets(args.input_file, layout, offset)
+    records = iter_csv_rows_with_offsets(args.input_file, 0)
+    first = next(records, None)
+    if first is None:
+        raise SystemExit("[ERROR] Input file is empty")
+    header, data_offset = first
+    if start_offset is not None:
+        records = iter_csv_rows_with_offsets(args.input_file, start_offset)
+    return header, data_offset, records
+
+
+def _enrichment_columns(args: Args) -> List[str]:
+    if args.committee_master is None:
+        if args.candidate_master is not None:
+            raise SystemExit("[ERROR] --candidate-master requires --committee-master (candidates are linked via committees)")
+        return []
+    return MasterFileEnricher.columns_for(args.candidate_master is not None)
+
+
+def _enricher(args: Args) -> Optional[MasterFileEnricher]:
+    if not _enrichment_columns(args):
+        return None
+    try:
+        return MasterFileEnricher.from_paths(args.committee_master, args.candidate_master)
+    except (EnrichmentError, OSError) as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+
+
+def _add_partition_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--input-file", type=Path, required=True, help="Source CSV file")
+    parser.add_argument("--output-dir", type=Path, required=True, help="Directory for per-partition CSV files")
+    parser.add_argument(
+        "--by",
+        type=str,
+        required=True,
+        help=f"Column to partition on (e.g. committee_id, contributor_state) or '{ELECTION_CYCLE}'",
+    )
+    parser.add_argument(
+        "--max-open-files",
+        type=int,
+        default=None,
+        help="Maximum simultaneously open output files (default: derived from the process fd limit)",
+    )
+    parser.add_argument("--overwrite", action="store_true", help="Allow writing into a non-empty output directory")
+
+
+def _add_serve_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--dataset",
+        dest="datasets",
+        type=str,
+        action="append",
+        default=[],
+        help="Dataset to serve as NAME=PATH or PATH (name defaults to the file stem); can be passed multiple times",
+    )
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help=f"Address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port to bind (default: {DEFAULT_PORT})")
+    parser.add_argument("--unix-socket", type=Path, default=None, help="Serve on this Unix socket instead of TCP")
+
+
+def _parse_datasets(specs: Sequence[str]) -> Dict[str, Path]:
+    datasets: Dict[str, Path] = {}
+    for spec in specs:
+        name, sep, path = spec.partition("=")
+        dataset_path = Path(path) if sep else Path(spec)
+        dataset_name = name if sep else dataset_path.stem
+        if not dataset_path.exists():
+            raise SystemExit(f"[ERROR] Dataset file not found: {dataset_path}")
+        if dataset_name in datasets:
+            raise SystemExit(f"[ERROR] Duplicate dataset name: {dataset_name}")
+        datasets[dataset_name] = dataset_path
+    if not datasets:
+        raise SystemExit("[ERROR] Provide at least one --dataset")
+    return datasets
+
+
+def run_serve(datasets: Sequence[str], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, unix_socket: Optional[Path] = None) -> None:
+    try:
+        server = FECServer(_parse_datasets(datasets), host=host, port=port, unix_socket=unix_socket)
+    except ServeError as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+    print(f"[INFO] Serving {', '.join(server.registry.names())} on {server.address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+def _add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--input-file",
+        dest="input_files",
+        type=Path,
+        action="append",
+        default=[],
+        help="CSV file to profile (can be passed multiple times; profiles are merged)",
+    )
+    parser.add_argument(
+        "--merge",
+        dest="merge_files",
+        type=Path,
+        action="append",
+        default=[],
+        help="Previously saved profile JSON to merge in (can be passed multiple times)",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Profile input files in parallel processes")
+    parser.add_argument("--output", type=Path, default=None, help="Save the mergeable profile (with sketches) as JSON")
+
+
+def run_profile(input_files: Sequence[Path], merge_files: Sequence[Path] = (), workers: int = 1, output: Optional[Path] = None) -> DatasetProfile:
+    if not input_files and not merge_files:
+        raise SystemExit("[ERROR] Provide at least one --input-file or --merge profile")
+    try:
+        profile = CSVProfilerService().profile(list(input_files), workers=workers)
+        for saved in merge_files:
+            with saved.open("r", encoding="utf-8") as f:
+                profile.merge(DatasetProfile.from_dict(json.load(f)))
+    except (ProfileError, ValueError, OSError) as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+    if output is not None:
+        ensure_parent_dir(output)
+        with output.open("w", encoding="utf-8") as f:
+            json.dump(profile.to_dict(), f)
+    print(json.dumps(profile.summary(), indent=2))
+    return profile
+
+
 def ensure_parent_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -110,113 +439,326 @@ def matches_filters(row: List[str], header: List[str], names: Sequence[str], ids
     return name_match or id_match
 
 
-def build_recipient(header: List[str], row: List[str]) -> str:
-    committee_name = row[header.index("committee_name")] if "committee_name" in header else ""
-    committee_id = row[header.index("committee_id")] if "committee_id" in header else ""
-    return f"{committee_name} ({committee_id})".strip()
-
-
-def build_contributor(header: List[str], row: List[str]) -> str:
-    name = row[header.index("contributor_name")] if "contributor_name" in header else ""
-    contrib_id = row[header.index("contributor_id")] if "contributor_id" in header else ""
-    if contrib_id and contrib_id != "C00401224":
-        return f"{name} ({contrib_id})"
-    return name
-
-
-def build_address(header: List[str], row: List[str]) -> str:
-    parts = [
-        row[header.index("contributor_street_1")] if "contributor_street_1" in header else "",
-        row[header.index("contributor_street_2")] if "contributor_street_2" in header else "",
-    ]
-    street = ", ".join([p for p in parts if p]).strip(", ")
-    city = row[header.index("contributor_city")] if "contributor_city" in header else ""
-    state = row[header.index("contributor_state")] if "contributor_state" in header else ""
-    zip_code = row[header.index("contributor_zip")] if "contributor_zip" in header else ""
-    prefix = street if street else ""
-    suffix = ", ".join([c for c in [city, state] if c])
-    if prefix and suffix:
-        base = f"{prefix}, {suffix}"
-    else:
-        base = prefix or suffix
-    return f"{base} {zip_code}".strip()
-
-
-def build_employer_occupation(header: List[str], row: List[str]) -> str:
-    employer = row[header.index("contributor_employer")] if "contributor_employer" in header else ""
-    occupation = row[header.index("contributor_occupation")] if "contributor_occupation" in header else ""
-    if employer or occupation:
-        if employer and occupation:
-            return f"{occupation}/{employer}"
-        return employer or occupation
-    return ""
+def write_xlsx(rows_with_links: Iterable[Tuple[List[str], Optional[str]]], output_path: Path, writer: XLSXWriterService) -> None:
+    ensure_parent_dir(output_path)
+    writer.write(rows_with_links, output_path)
 
 
-def get_value(header: List[str], row: List[str], column: str) -> str:
-    return row[header.index(column)] if column in header else ""
+def _filter_spec(args: Args) -> FilterSpec:
+    return FilterSpec(
+        names=tuple(args.contributor_names),
+        ids=tuple(args.contributor_ids),
+        name_contains=tuple(getattr(args, "contributor_name_contains", ())),
+    )
 
 
-def build_row(header: List[str], row: List[str]) -> List[str]:
-    recipient = build_recipient(header, row)
-    contributor = build_contributor(header, row)
-    address = build_address(header, row)
-    occ_emp = build_employer_occupation(header, row)
-    date = get_value(header, row, "contribution_receipt_date")
-    amount = get_value(header, row, "contribution_receipt_amount")
-    fec_id = get_value(header, row, "image_number")
-    return [recipient, contributor, address, occ_emp, date, amount, fec_id]
+def _collect_checkpointed(args: Args, builder: FECRowBuilder, build: Optional[RowBuildFn] = None) -> List[Tuple[List[str], Optional[str]]]:
+    """Filter and sort the input, spilling sorted runs and progress to disk.
+
+    Each checkpoint records the input byte offset reached together with the
+    sorted runs written so far; a resumed run continues from that offset and
+    merges the runs, producing the same row order as an uninterrupted run.
+    """
+    if args.checkpoint_every < 1:
+        raise SystemExit("[ERROR] --checkpoint-every must be at least 1")
+    output_path = args.output_path
+    store = CheckpointStore(checkpoint_path_for(output_path))
+    runs = SortedRunStore(output_path.with_suffix(output_path.suffix + ".runs"))
+    inputs = fingerprint_inputs([args.input_file])
+    filters = {
+        "names": list(args.contributor_names),
+        "ids": list(args.contributor_ids),
+        "contains": list(getattr(args, "contributor_name_contains", ())),
+        "masters": [str(p) for p in (args.committee_master, args.candidate_master) if p is not None],
+    }
+
+    layout = _bulk_layout(args.input_format, args.bulk_header_file)
+    columns = layout.source_columns if layout is not None else None
+
+    try:
+        state = store.load_matching("format", inputs, filters=filters, columns=columns) if args.resume else None
+        run_names: List[str] = list(state["runs"]) if state is not None else []
+        if state is not None:
+            runs.check(run_names)
+    except CheckpointError as exc:
+        raise SystemExit(f"[ERROR] {exc}")
+    if state is not None:
+        header, _data_offset, records = _open_with_offsets(args, layout, state["input_offset"])
+        offset = state["input_offset"]
+        seq = state["rows_matched"]
+        scanned = state["rows_scanned"]
+    else:
+        header, offset, records = _open_with_offsets(args, layout)
+        runs.clear()
+        seq = 0
+        scanned = 0
+
+    spec = _filter_spec(args)
+    predicate = builder.compile_filter(header, spec.names, spec.ids, spec.name_contains)
+    buffer: List[Tuple[int, TypedRow]] = []
+
+    def save() -> None:
+        if buffer:
+            run_names.append(runs.write_run(len(run_names), buffer))
+            buffer.clear()
+        store.save(
+            {
+                "kind": "format",
+                "inputs": inputs,
+                "filters": filters,
+                "columns": columns,
+                "input_offset": offset,
+                "rows_scanned": scanned,
+                "rows_matched": seq,
+                "runs": run_names,
+            }
+        )
 
+    def matching() -> Iterator[List[str]]:
+        # Resumes only after the caller has buffered the previous match,
+        # so every checkpoint covers all rows scanned before it
+        nonlocal offset, scanned
+        for row, offset in records:
+            if not row:
+                continue
+            scanned += 1
+            if predicate(row):
+                yield row
+            if scanned % args.checkpoint_every == 0:
+                save()
+
+    for typed in build_rows(matching(), header, build or builder.build_row):
+        buffer.append((seq, typed))
+        seq += 1
+    save()
+
+    return [(v, link) for (v, link, _dt) in runs.iter_merged(run_names)]
+
+
+def run_sample(args: Args, container: Optional[Container] = None) -> SampleResult:
+    """Write a reservoir sample of the rows matching the filters.
+
+    Matching is done in the same streaming pass that counts matches, so the
+    reported count is exact unless a byte or time budget cut the scan short.
+    """
+    if args.checkpoint or args.resume:
+        raise SystemExit("[ERROR] --sample cannot be combined with --checkpoint/--resume")
+    if args.sample is None or args.sample < 1:
+        raise SystemExit("[ERROR] --sample must be a positive row count")
+    _require_single_input(args, "--sample")
+    container = container or Container()
+    builder = container.create_row_builder()
+    enricher = _enricher(args)
+    writer = container.create_xlsx_writer(enricher.columns if enricher else ())
+    build = enricher.build_with(builder.build_row) if enricher else builder.build_row
+
+    try:
+        header, _data_offset, records = _open_with_offsets(args, _bulk_layout(args.input_format, args.bulk_header_file))
+        spec = _filter_spec(args)
+        predicate = builder.compile_filter(header, spec.names, spec.ids, spec.name_contains)
+        result = sample_matching_rows(
+            records,
+            predicate,
+            args.sample,
+            seed=args.sample_seed,
+            total_bytes=args.input_file.stat().st_size,
+            max_bytes=args.sample_max_bytes,
+            max_seconds=args.sample_max_seconds,
+        )
+        typed_rows = sort_rows(build_rows(result.rows, header, build))
+    finally:
+        if enricher is not None:
+            enricher.close()
+
+    write_xlsx([(v, link) for (v, link, _dt) in typed_rows], args.output_path, writer)
+    if result.complete:
+        matches = f"{result.rows_matched} matching rows"
+    else:
+        matches = (
+            f"~{result.estimated_matches} matching rows (estimated; {result.rows_matched} matched "
+            f"in the first {result.bytes_read} of {result.total_bytes} bytes)"
+        )
+    print(f"[SUCCESS] Wrote {len(typed_rows)} sampled rows of {matches} to '{args.output_path}'")
+    return result
 
-def write_xlsx(rows_with_links: Iterable[Tuple[List[str], Optional[str]]], output_path: Path, writer: XLSXWriterService) -> None:
-    ensure_parent_dir(output_path)
-    writer.write(rows_with_links, output_path)
 
+def _input_files(args: Args) -> List[Path]:
+    """Explicit --input-file values followed by --input-dir matches, in order.
 
-def run_format(args: Args) -> Path:
-    container = Container()
-    builder = container.create_row_builder()
-    writer = container.create_xlsx_writer()
-    with args.input_file.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.reader(f)
+    A file named more than once (or both explicitly and via the directory)
+    is kept only at its first position.
+    """
+    candidates = list(args.input_files) or ([args.input_file] if args.input_file.name else [])
+    if args.input_dir is not None:
         try:
-            header = next(reader)
-        except StopIteration:
-            raise SystemExit("[ERROR] Input file is empty")
-
-        typed_rows: List[Tuple[List[str], Optional[str], Optional[datetime]]] = []
-        pdf_idx = header.index("pdf_url") if "pdf_url" in header else -1
-        for row in reader:
-            if not row:
-                continue
-            if not builder.matches_filters(row, header, args.contributor_names, args.contributor_ids, getattr(args, "contributor_name_contains", ())):
-                continue
-            pdf_url = row[pdf_idx] if pdf_idx >= 0 and pdf_idx < len(row) else None
-            values = build_row(header, row)
-            date_str = values[OUTPUT_COLUMNS.index("Contribution Date")]
-            dt = _parse_date(date_str)
-            typed_rows.append((values, pdf_url, dt))
-
-    # Sort reverse-chronologically by date, keeping None dates last
-    def _cmp(a: Tuple[List[str], Optional[str], Optional[datetime]],
-             b: Tuple[List[str], Optional[str], Optional[datetime]]) -> int:
-        da = a[2]
-        db = b[2]
-        if da is None and db is None:
-            return 0
-        if da is None:
-            return 1
-        if db is None:
-            return -1
-        if da > db:
-            return -1
-        if da < db:
-            return 1
-        return 0
-
-    typed_rows.sort(key=cmp_to_key(_cmp))
-    output_rows: List[Tuple[List[str], Optional[str]]] = [(v, link) for (v, link, _dt) in typed_rows]
+            candidates.extend(CSVCombinerService().list_inputs(args.input_dir, args.pattern))
+        except CSVCombineError as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+    if not candidates:
+        raise SystemExit("[ERROR] Provide --input-file or --input-dir")
+    seen: Dict[Path, None] = {}
+    files: List[Path] = []
+    for path in candidates:
+        resolved = path.resolve()
+        if resolved not in seen:
+            seen[resolved] = None
+            files.append(path)
+    return files
+
+
+def _runs_in_workers(args: Args, files: Sequence[Path]) -> bool:
+    return args.workers > 1 and len(files) > 1
+
+
+def _require_single_input(args: Args, option: str) -> None:
+    files = _input_files(args)
+    if len(files) > 1:
+        raise SystemExit(f"[ERROR] {option} supports a single input file")
+    args.input_file = files[0]
+
+
+def _typed_rows_for_file(
+    args: Args,
+    path: Path,
+    container: Container,
+    enricher: Optional[MasterFileEnricher],
+    hashes: Optional[Dict[Path, FileHash]] = None,
+) -> Iterator[TypedRow]:
+    """Stream one input through the format pipeline.
+
+    With ``hashes`` the file's content hash is taken in the same read and
+    recorded there once the file has been consumed to the end.
+    """
+    pipeline = FormatPipeline(container=container, filters=_filter_spec(args), enricher=enricher)
+    layout = _bulk_layout(args.input_format, args.bulk_header_file)
+    if layout is not None:
+        text: Dict[str, Any] = {"encoding": "utf-8", "errors": "replace", "newline": "\n"}
+    else:
+        text = {"encoding": "utf-8-sig", "newline": ""}
+    reader = HashingReader(path) if hashes is not None else None
+    with reader.open_text(**text) if reader is not None else path.open("r", **text) as f:
+        if layout is not None:
+            yield from pipeline.iter_typed(map_bulk_lines(f, layout), header=layout.header)
+        else:
+            yield from pipeline.iter_typed(f)
+    if reader is not None and hashes is not None:
+        hashes[path] = reader.result()
+
+
+def _collect_file_rows(args: Args, path: Path, hash_input: bool = False) -> Tuple[List[TypedRow], Optional[FileHash]]:
+    # Module-level so it can run in a worker process; each worker loads its own masters
+    enricher = _enricher(args)
+    hashes: Optional[Dict[Path, FileHash]] = {} if hash_input else None
+    try:
+        rows = list(_typed_rows_for_file(args, path, Container(), enricher, hashes))
+        return rows, hashes.get(path) if hashes is not None else None
+    finally:
+        if enricher is not None:
+            enricher.close()
+
+
+def _collect_fused(
+    args: Args,
+    files: List[Path],
+    container: Container,
+    enricher: Optional[MasterFileEnricher],
+    hashes: Optional[Dict[Path, FileHash]] = None,
+) -> List[TypedRow]:
+    """Filter, build and sort rows from all inputs without an intermediate combined file.
+
+    Rows are concatenated in input order before the stable sort, so the result
+    matches running ``combine`` followed by ``format-xlsx``.
+    """
+    if len(files) > 1:
+        try:
+            CSVCombinerService().check_headers(files, _bulk_layout(args.input_format, args.bulk_header_file))
+        except CSVCombineError as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+    try:
+        if _runs_in_workers(args, files):
+            with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                parts = list(pool.map(partial(_collect_file_rows, args, hash_input=hashes is not None), files))
+            if hashes is not None:
+                hashes.update((p, h) for p, (_rows, h) in zip(files, parts) if h is not None)
+            return sort_rows(chain.from_iterable(rows for rows, _h in parts))
+        return sort_rows(chain.from_iterable(_typed_rows_for_file(args, p, container, enricher, hashes) for p in files))
+    except PipelineError:
+        raise SystemExit("[ERROR] Input file is empty")
+
+
+def _cache_key_parts(args: Args, container: Container, cache: OutputCache, input_hashes: Sequence[str]) -> Dict[str, Any]:
+    """Everything that determines the rendered workbook, with filters normalized."""
+    spec = _filter_spec(args)
+    optional_files = (args.bulk_header_file, args.committee_master, args.candidate_master)
+    return {
+        "version": __version__,
+        "format": "xlsx",
+        "input": list(input_hashes),
+        "input_format": args.input_format,
+        "aux_inputs": [cache.content_hash(p) if p is not None else None for p in optional_files],
+        "filters": {
+            "names": sorted({_norm(n) for n in spec.names}),
+            "ids": sorted({_norm(i) for i in spec.ids}),
+            "contains": sorted({_norm(c) for c in spec.name_contains}),
+        },
+        "style": asdict(container.config.style),
+    }
+
+
+def run_format(args: Args, container: Optional[Container] = None) -> Path:
+    sample_options = {
+        "--sample-seed": args.sample_seed,
+        "--sample-max-bytes": args.sample_max_bytes,
+        "--sample-max-seconds": args.sample_max_seconds,
+    }
+    given = [option for option, value in sample_options.items() if value is not None]
+    if given:
+        raise SystemExit(f"[ERROR] {', '.join(given)} can only be used with --sample")
+    container = container or Container()
+    cache: Optional[OutputCache] = None
+    hashes: Optional[Dict[Path, FileHash]] = None
+    if not args.no_cache:
+        cache = OutputCache(args.cache_dir or default_cache_dir(), args.cache_max_bytes)
+        files = _input_files(args)
+        known = [cache.known_hash(p) for p in files]
+        if all(known):
+            key = cache.key(_cache_key_parts(args, container, cache, [h for h in known if h]))
+            meta = cache.fetch(key, args.output_path)
+            if meta is not None:
+                print(f"[SUCCESS] Wrote {meta.get('rows', 0)} rows to '{args.output_path}' (cached)")
+                return args.output_path
+        # Inputs not seen at this path, size and mtime are hashed while they stream
+        # rather than read twice; such a run renders even if an equal file was cached
+        hashes = {}
+    builder = container.create_row_builder()
+    writer = container.create_xlsx_writer(_enrichment_columns(args))
+    checkpointing = args.checkpoint or args.resume
+    if checkpointing:
+        _require_single_input(args, "--checkpoint/--resume")
+    files = _input_files(args)
+    # Worker processes load their own masters, so the parent only needs them in-process
+    enricher = None if not checkpointing and _runs_in_workers(args, files) else _enricher(args)
+    try:
+        if checkpointing:
+            build = enricher.build_with(builder.build_row) if enricher else builder.build_row
+            output_rows = _collect_checkpointed(args, builder, build)
+        else:
+            typed_rows = _collect_fused(args, files, container, enricher, hashes)
+            output_rows = [(v, link) for (v, link, _dt) in typed_rows]
+    finally:
+        if enricher is not None:
+            enricher.close()
 
     write_xlsx(output_rows, args.output_path, writer)
+    if checkpointing:
+        CheckpointStore(checkpoint_path_for(args.output_path)).clear()
+        SortedRunStore(args.output_path.with_suffix(args.output_path.suffix + ".runs")).clear()
+    if cache is not None and hashes is not None:
+        for file_hash in hashes.values():
+            cache.remember(file_hash)
+        # A resumed run reads only part of its input, so checkpointed inputs are hashed here
+        input_hashes = [hashes[p].sha256 if p in hashes else cache.content_hash(p) for p in _input_files(args)]
+        cache.store(cache.key(_cache_key_parts(args, container, cache, input_hashes)), args.output_path, {"rows": len(output_rows)})
     print(f"[SUCCESS] Wrote {len(output_rows)} rows to '{args.output_path}'")
     return args.output_path
 
@@ -244,16 +786,64 @@ def main() -> None:
         comb_parser.add_argument("--pattern", type=str, default="*.csv")
         comb_parser.add_argument("--output", type=Path, required=True)
         comb_parser.add_argument("--overwrite", action="store_true")
+        comb_parser.add_argument("--union-schema", action="store_true")
+        _add_checkpoint_arguments(comb_parser)
+        _add_input_format_arguments(comb_parser)
         comb_ns, _ = comb_parser.parse_known_args(sys.argv[2:])
         combiner = CSVCombinerService()
-        result = combiner.combine(
-            input_dir=comb_ns.input_dir,
-            output_path=comb_ns.output,
-            pattern=comb_ns.pattern,
-            overwrite=bool(comb_ns.overwrite),
-        )
+        try:
+            result = combiner.combine(
+                input_dir=comb_ns.input_dir,
+                output_path=comb_ns.output,
+                pattern=comb_ns.pattern,
+                overwrite=bool(comb_ns.overwrite),
+                checkpoint=bool(comb_ns.checkpoint),
+                resume=bool(comb_ns.resume),
+                checkpoint_every=comb_ns.checkpoint_every,
+                bulk_layout=_bulk_layout(comb_ns.input_format, comb_ns.bulk_header_file),
+                union_schema=bool(comb_ns.union_schema),
+            )
+        except (CSVCombineError, CheckpointError) as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+        for remap in result.remapped_files:
+            missing = ", ".join(remap.missing_columns) or "none"
+            order = "reordered" if remap.reordered else "same order"
+            print(f"[INFO] Remapped '{remap.path.name}': missing columns: {missing}; {order}")
         print(f"[SUCCESS] Combined {result.files_combined} files, wrote {result.rows_written} rows to '{result.output_path}'")
         return
+    elif command == "profile":
+        prof_parser = argparse.ArgumentParser(prog="profile")
+        _add_profile_arguments(prof_parser)
+        prof_ns, _ = prof_parser.parse_known_args(sys.argv[2:])
+        run_profile(prof_ns.input_files, prof_ns.merge_files, prof_ns.workers, prof_ns.output)
+        return
+    elif command == "partition":
+        part_parser = argparse.ArgumentParser(prog="partition")
+        _add_partition_arguments(part_parser)
+        part_ns, _ = part_parser.parse_known_args(sys.argv[2:])
+        try:
+            result = CSVPartitionerService().partition(
+                input_file=part_ns.input_file,
+                output_dir=part_ns.output_dir,
+                by=part_ns.by,
+                overwrite=bool(part_ns.overwrite),
+                max_open_files=part_ns.max_open_files,
+            )
+        except CSVPartitionError as exc:
+            raise SystemExit(f"[ERROR] {exc}")
+        print(
+            f"[SUCCESS] Wrote {result.rows_written} rows into {len(result.partitions)} partitions; "
+            f"manifest at '{result.manifest_path}'"
+        )
+        return
+    elif command == "serve":
+        serve_parser = argparse.ArgumentParser(prog="serve")
+        _add_serve_arguments(serve_parser)
+        serve_ns, _ = serve_parser.parse_known_args(sys.argv[2:])
+        run_serve(serve_ns.datasets, serve_ns.host, serve_ns.port, serve_ns.unix_socket)
+        return
+    elif args.sample is not None:
+        run_sample(args)
     else:
         run_format(args)
 
@@ -3,8 +3,27 @@ from __future__ import annotations
 import csv
 import os
 from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import Iterator, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .checkpoint import (
+    DEFAULT_CHECKPOINT_EVERY,
+    CheckpointError,
+    CheckpointStore,
+    checkpoint_path_for,
+    fingerprint_inputs,
+)
+from .readers import BulkLayout, iter_bulk_rows, iter_bulk_rows_with_offsets, iter_csv_rows_with_offsets
+
+
+@dataclass(frozen=True)
+class RemappedFile:
+    """How one input's columns were projected onto the union schema."""
+
+    path: Path
+    missing_columns: Tuple[str, ...]
+    reordered: bool
 
 
 @dataclass(frozen=True)
@@ -13,6 +32,39 @@ class CombineResult:
     rows_written: int
     header_columns: int
     output_path: Path
+    remapped_files: Tuple[RemappedFile, ...] = ()
+
+
+def union_columns(headers: Sequence[Sequence[str]]) -> List[str]:
+    """Union of ``headers`` in first-seen column order."""
+    seen: Dict[str, None] = {}
+    for header in headers:
+        for column in header:
+            seen.setdefault(column, None)
+    return list(seen)
+
+
+def _projector(header: Sequence[str], target: Sequence[str]) -> Callable[[List[str]], List[str]]:
+    """Build a row remapper from ``header`` order to ``target`` order.
+
+    Column positions are resolved once; each row is padded to the source
+    width plus one empty sentinel cell that missing columns point at, then
+    projected with a single ``itemgetter`` call.
+    """
+    width = len(header)
+    positions = {column: i for i, column in reversed(list(enumerate(header)))}
+    getter = itemgetter(*(positions.get(column, width) for column in target))
+    single = len(target) == 1
+
+    def project(row: List[str]) -> List[str]:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+        elif len(row) > width:
+            del row[width:]
+        row.append("")
+        return [getter(row)] if single else list(getter(row))
+
+    return project
 
 
 class CSVCombineError(Exception):
@@ -26,14 +78,25 @@ class CSVCombinerService:
         output_path: Path,
         pattern: str = "*.csv",
         overwrite: bool = False,
+        checkpoint: bool = False,
+        resume: bool = False,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        bulk_layout: Optional[BulkLayout] = None,
+        union_schema: bool = False,
     ) -> CombineResult:
-        input_dir = input_dir.resolve()
-        if not input_dir.exists() or not input_dir.is_dir():
-            raise CSVCombineError(f"Input directory not found or not a directory: {input_dir}")
+        """Concatenate matching files under one header.
 
-        files = sorted(input_dir.glob(pattern))
-        if not files:
-            raise CSVCombineError(f"No CSV files found in {input_dir} matching '{pattern}'")
+        With ``bulk_layout`` the inputs are headerless FEC bulk (pipe-delimited)
+        files; they are converted to comma CSV with export-style column names
+        in the same pass.
+
+        With ``union_schema`` files whose headers differ are not rejected:
+        the output header is the union of all headers (first-seen order) and
+        each row is projected onto it, leaving absent columns empty.
+        """
+        if checkpoint_every < 1:
+            raise CSVCombineError(f"checkpoint_every must be at least 1, got {checkpoint_every}")
+        files = self.list_inputs(input_dir, pattern)
 
         output_path.parent.mkdir(parents=True, exist_ok=True)
         if output_path.exists() and not overwrite:
@@ -42,31 +105,97 @@ class CSVCombinerService:
             )
 
         first_header: Optional[List[str]] = None
+        union_header: Optional[List[str]] = None
+        projectors: Dict[int, Callable[[List[str]], List[str]]] = {}
+        remapped: List[RemappedFile] = []
+        if union_schema and bulk_layout is None:
+            headers = [self._read_header(p) for p in files]
+            union_header = union_columns(headers)
+            for index, (csv_path, header) in enumerate(zip(files, headers)):
+                if header == union_header:
+                    continue
+                projectors[index] = _projector(header, union_header)
+                present = set(header)
+                missing = tuple(c for c in union_header if c not in present)
+                order = [c for c in union_header if c in present]
+                remapped.append(RemappedFile(csv_path, missing, reordered=order != header))
         files_combined = 0
         rows_written = 0
 
         temp_path = output_path.with_suffix(output_path.suffix + ".tmp")
+        checkpoint = checkpoint or resume
+        store = CheckpointStore(checkpoint_path_for(output_path)) if checkpoint else None
+        inputs = fingerprint_inputs(files) if store else []
+        columns = bulk_layout.source_columns if bulk_layout is not None else None
+        # Only recorded when set, so checkpoints from plain runs stay resumable
+        schema = {"union_schema": True} if union_schema else {}
+        state = store.load_matching("combine", inputs, columns=columns, **schema) if store and resume else None
+        if state is not None and not temp_path.exists():
+            raise CheckpointError(f"Checkpoint found but partial output is missing: {temp_path}")
+
+        start_file = state["completed_files"] if state else 0
+        start_offset = state["input_offset"] if state else 0
+        if state is not None:
+            rows_written = state["rows_written"]
+            # Drop anything written after the last consistent checkpoint
+            with temp_path.open("r+b") as f:
+                f.truncate(state["output_offset"])
+
         try:
-            with temp_path.open("w", encoding="utf-8", newline="") as out_f:
+            mode = "a" if state is not None else "w"
+            with temp_path.open(mode, encoding="utf-8", newline="") as out_f:
                 writer = csv.writer(out_f)
-                for csv_path in files:
-                    header = self._read_header(csv_path)
+                for index, csv_path in enumerate(files):
+                    if union_header is not None:
+                        # Every file is projected onto the union, so they all share its header
+                        header = union_header
+                    else:
+                        header = bulk_layout.header if bulk_layout is not None else self._read_header(csv_path)
                     if first_header is None:
                         first_header = header
-                        writer.writerow(first_header)
+                        if state is None:
+                            writer.writerow(first_header)
                     else:
                         if header != first_header:
                             raise CSVCombineError(
                                 "Header mismatch detected between files; refusing to combine"
                             )
+                    project = projectors.get(index)
+
+                    if index < start_file:
+                        files_combined += 1
+                        continue
 
-                    for row in self._iter_rows_excluding_header(csv_path):
-                        writer.writerow(row)
-                        rows_written += 1
+                    if store is None:
+                        if bulk_layout is not None:
+                            rows = iter_bulk_rows(csv_path, bulk_layout)
+                        else:
+                            rows = self._iter_rows_excluding_header(csv_path)
+                        if project is not None:
+                            rows = map(project, rows)
+                        for row in rows:
+                            writer.writerow(row)
+                            rows_written += 1
+                    else:
+                        offset = start_offset if index == start_file else 0
+                        if bulk_layout is not None:
+                            records = iter_bulk_rows_with_offsets(csv_path, bulk_layout, offset)
+                        else:
+                            records = self._iter_rows_with_offsets(csv_path, offset)
+                        for row, offset in records:
+                            writer.writerow(project(row) if project is not None else row)
+                            rows_written += 1
+                            if rows_written % checkpoint_every == 0:
+                                self._save_checkpoint(store, out_f, inputs, columns, index, offset, rows_written, schema)
+                        # Record the file boundary so a resume skips it entirely
+                        self._save_checkpoint(store, out_f, inputs, columns, index + 1, 0, rows_written, schema)
                     files_combined += 1
             os.replace(temp_path, output_path)
+            if store is not None:
+                store.clear()
         finally:
-            if temp_path.exists():
+            # A checkpointed run keeps its partial output so it can be resumed
+            if store is None and temp_path.exists():
                 try:
                     temp_path.unlink()
                 except OSError:
@@ -77,8 +206,32 @@ class CSVCombinerService:
             rows_written=rows_written,
             header_columns=len(first_header or []),
             output_path=output_path,
+            remapped_files=tuple(remapped),
         )
 
+    def list_inputs(self, input_dir: Path, pattern: str = "*.csv") -> List[Path]:
+        input_dir = input_dir.resolve()
+        if not input_dir.exists() or not input_dir.is_dir():
+            raise CSVCombineError(f"Input directory not found or not a directory: {input_dir}")
+
+        files = sorted(input_dir.glob(pattern))
+        if not files:
+            raise CSVCombineError(f"No CSV files found in {input_dir} matching '{pattern}'")
+        return files
+
+    def check_headers(self, files: List[Path], bulk_layout: Optional[BulkLayout] = None) -> List[str]:
+        """Return the header shared by ``files``, applying the same checks as ``combine``."""
+        if bulk_layout is not None:
+            return bulk_layout.header
+        first_header: Optional[List[str]] = None
+        for csv_path in files:
+            header = self._read_header(csv_path)
+            if first_header is None:
+                first_header = header
+            elif header != first_header:
+                raise CSVCombineError("Header mismatch detected between files; refusing to combine")
+        return first_header or []
+
     def _read_header(self, file_path: Path) -> List[str]:
         with file_path.open("r", encoding="utf-8-sig", newline="") as f:
             reader = csv.reader(f)
@@ -102,5 +255,37 @@ class CSVCombinerService:
                     continue
                 yield row
 
+    def _iter_rows_with_offsets(self, file_path: Path, start_offset: int) -> Iterator[Tuple[List[str], int]]:
+        records = iter_csv_rows_with_offsets(file_path, start_offset)
+        if start_offset == 0:
+            next(records, None)
+        for row, offset in records:
+            if not row or all(cell == "" for cell in row):
+                continue
+            yield row, offset
 
-
+    def _save_checkpoint(
+        self,
+        store: CheckpointStore,
+        out_f: Any,
+        inputs: List[Dict[str, Any]],
+        columns: Optional[List[str]],
+        completed_files: int,
+        input_offset: int,
+        rows_written: int,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        out_f.flush()
+        os.fsync(out_f.fileno())
+        store.save(
+            {
+                "kind": "combine",
+                "inputs": inputs,
+                "columns": columns,
+                "completed_files": completed_files,
+                "input_offset": input_offset,
+                "output_offset": out_f.tell(),
+                "rows_written": rows_written,
+                **(extra or {}),
+            }
+        )
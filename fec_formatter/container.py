@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Sequence
+
 from .config import AppConfig
 from .services import FECRowBuilder, XLSXWriterService
 
@@ -15,8 +17,8 @@ class Container:
     def create_row_builder(self) -> FECRowBuilder:
         return FECRowBuilder()
 
-    def create_xlsx_writer(self) -> XLSXWriterService:
-        return XLSXWriterService(self.config.style)
+    def create_xlsx_writer(self, extra_columns: Sequence[str] = ()) -> XLSXWriterService:
+        return XLSXWriterService(self.config.style, tuple(extra_columns))
 
 
 
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import mmap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .readers import read_bulk_header
+
+
+# Column layouts of the FEC committee (cm.txt) and candidate (cn.txt) master files
+COMMITTEE_MASTER_COLUMNS = [
+    "CMTE_ID", "CMTE_NM", "TRES_NM", "CMTE_ST1", "CMTE_ST2", "CMTE_CITY", "CMTE_ST", "CMTE_ZIP",
+    "CMTE_DSGN", "CMTE_TP", "CMTE_PTY_AFFILIATION", "CMTE_FILING_FREQ", "ORG_TP", "CONNECTED_ORG_NM", "CAND_ID",
+]
+CANDIDATE_MASTER_COLUMNS = [
+    "CAND_ID", "CAND_NAME", "CAND_PTY_AFFILIATION", "CAND_ELECTION_YR", "CAND_OFFICE_ST", "CAND_OFFICE",
+    "CAND_OFFICE_DISTRICT", "CAND_ICI", "CAND_STATUS", "CAND_PCC", "CAND_ST1", "CAND_ST2", "CAND_CITY",
+    "CAND_ST", "CAND_ZIP",
+]
+
+COMMITTEE_TYPES = {
+    "C": "Communication Cost",
+    "D": "Delegate Committee",
+    "E": "Electioneering Communication",
+    "H": "House",
+    "I": "Independent Expenditor",
+    "N": "PAC - Nonqualified",
+    "O": "Super PAC",
+    "P": "Presidential",
+    "Q": "PAC - Qualified",
+    "S": "Senate",
+    "U": "Single-Candidate Independent Expenditure",
+    "V": "Hybrid PAC - Nonqualified",
+    "W": "Hybrid PAC - Qualified",
+    "X": "Party - Nonqualified",
+    "Y": "Party - Qualified",
+    "Z": "National Party Nonfederal Account",
+}
+
+COMMITTEE_COLUMNS = ["Committee Type", "Committee Party"]
+CANDIDATE_COLUMNS = ["Candidate", "Candidate Party"]
+
+RowBuildFn = Callable[[List[str], List[str]], List[str]]
+
+
+class EnrichmentError(Exception):
+    pass
+
+
+def _column_index(columns: Sequence[str], name: str, source: Path) -> int:
+    try:
+        return list(columns).index(name)
+    except ValueError:
+        raise EnrichmentError(f"Column {name} missing from layout of {source}") from None
+
+
+class CommitteeMaster:
+    """Committee master loaded into a dict of compact tuples keyed by CMTE_ID.
+
+    Each entry is ``(name, type, party, candidate_id)``; the committee master
+    is small enough (tens of thousands of rows) to hold entirely in memory.
+    """
+
+    def __init__(self, path: Path, columns: Optional[Sequence[str]] = None) -> None:
+        columns = list(columns or COMMITTEE_MASTER_COLUMNS)
+        picks = [_column_index(columns, c, path) for c in ("CMTE_ID", "CMTE_NM", "CMTE_TP", "CMTE_PTY_AFFILIATION", "CAND_ID")]
+        width = max(picks) + 1
+        self.entries: Dict[str, Tuple[str, str, str, str]] = {}
+        with path.open("r", encoding="utf-8", errors="replace", newline="\n") as f:
+            for line in f:
+                parts = line.rstrip("\r\n").split("|")
+                if len(parts) < width:
+                    continue
+                cid, name, ctype, party, cand = (parts[i] for i in picks)
+                self.entries[cid] = (name, ctype, party, cand)
+
+    def get(self, committee_id: str) -> Optional[Tuple[str, str, str, str]]:
+        return self.entries.get(committee_id)
+
+
+class CandidateIndex:
+    """Memory-mapped candidate master with an in-memory CAND_ID -> line offset index.
+
+    Only ids and integer offsets are held in memory; candidate fields are
+    decoded from the mapped file on lookup.
+    """
+
+    def __init__(self, path: Path, columns: Optional[Sequence[str]] = None) -> None:
+        columns = list(columns or CANDIDATE_MASTER_COLUMNS)
+        self._id_idx = _column_index(columns, "CAND_ID", path)
+        self._name_idx = _column_index(columns, "CAND_NAME", path)
+        self._party_idx = _column_index(columns, "CAND_PTY_AFFILIATION", path)
+        self._file = path.open("rb")
+        self._offsets: Dict[str, int] = {}
+        size = path.stat().st_size
+        self._map: Optional[mmap.mmap] = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        if self._map is None:
+            return
+        pos = 0
+        while pos < size:
+            end = self._map.find(b"\n", pos)
+            if end < 0:
+                end = size
+            line = self._map[pos:end]
+            cand_id = line.split(b"|", self._id_idx + 1)[self._id_idx] if line.count(b"|") >= self._id_idx else b""
+            if cand_id:
+                self._offsets[cand_id.decode("ascii", errors="replace")] = pos
+            pos = end + 1
+
+    def get(self, candidate_id: str) -> Optional[Tuple[str, str]]:
+        pos = self._offsets.get(candidate_id)
+        if pos is None or self._map is None:
+            return None
+        end = self._map.find(b"\n", pos)
+        parts = self._map[pos:end if end >= 0 else len(self._map)].decode("utf-8", errors="replace").rstrip("\r").split("|")
+        name = parts[self._name_idx] if self._name_idx < len(parts) else ""
+        party = parts[self._party_idx] if self._party_idx < len(parts) else ""
+        return name, party
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+@dataclass
+class MasterFileEnricher:
+    """Joins streamed rows to the committee/candidate masters by committee_id."""
+
+    committees: CommitteeMaster
+    candidates: Optional[CandidateIndex] = None
+
+    @classmethod
+    def from_paths(
+        cls,
+        committee_master: Path,
+        candidate_master: Optional[Path] = None,
+        committee_header: Optional[Path] = None,
+        candidate_header: Optional[Path] = None,
+    ) -> "MasterFileEnricher":
+        cm_columns = read_bulk_header(committee_header) if committee_header else None
+        cn_columns = read_bulk_header(candidate_header) if candidate_header else None
+        candidates = CandidateIndex(candidate_master, cn_columns) if candidate_master else None
+        return cls(CommitteeMaster(committee_master, cm_columns), candidates)
+
+    @property
+    def columns(self) -> List[str]:
+        return self.columns_for(self.candidates is not None)
+
+    @staticmethod
+    def columns_for(with_candidates: bool) -> List[str]:
+        """Extra output columns, known without loading the master files."""
+        return COMMITTEE_COLUMNS + (CANDIDATE_COLUMNS if with_candidates else [])
+
+    def lookup(self, committee_id: str) -> Tuple[Optional[str], List[str]]:
+        """Return the committee name (if known) and the extra column values."""
+        entry = self.committees.get(committee_id)
+        if entry is None:
+            return None, [""] * len(self.columns)
+        name, ctype, party, cand_id = entry
+        label = COMMITTEE_TYPES.get(ctype)
+        extras = [f"{label} ({ctype})" if label else ctype, party]
+        if self.candidates is not None:
+            cand = self.candidates.get(cand_id) if cand_id else None
+            if cand is None:
+                extras.extend([cand_id, ""])
+            else:
+                extras.extend([f"{cand[0]} ({cand_id})", cand[1]])
+        return name, extras
+
+    def build_with(self, build: RowBuildFn) -> RowBuildFn:
+        """Wrap a row builder so each built row carries the enrichment columns.
+
+        When the source row has no committee_name (as in bulk files) the
+        Recipient falls back to the name from the committee master.
+        """
+        # Column positions are looked up once per header, not per row
+        cached: List[object] = [None, (-1, -1)]
+
+        def enriched(header: List[str], row: List[str]) -> List[str]:
+            if cached[0] is not header:
+                cached[0] = header
+                cached[1] = (
+                    header.index("committee_id") if "committee_id" in header else -1,
+                    header.index("committee_name") if "committee_name" in header else -1,
+                )
+            cid_idx, name_idx = cached[1]  # type: ignore[misc]
+            committee_id = row[cid_idx] if 0 <= cid_idx < len(row) else ""
+            values = build(header, row)
+            name, extras = self.lookup(committee_id)
+            has_name = 0 <= name_idx < len(row) and row[name_idx]
+            if name and not has_name:
+                values[0] = f"{name} ({committee_id})"
+            return values + extras
+
+        return enriched
+
+    def close(self) -> None:
+        if self.candidates is not None:
+            self.candidates.close()
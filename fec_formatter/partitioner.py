@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import csv
+import json
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, List, Optional, Tuple
+
+from .services import _parse_date
+
+try:  # pragma: no cover - resource is unavailable on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+
+ELECTION_CYCLE = "election_cycle"
+MANIFEST_NAME = "manifest.json"
+BLANK_KEY_NAME = "_blank"
+
+
+@dataclass(frozen=True)
+class PartitionResult:
+    rows_written: int
+    partitions: Dict[str, int]
+    files: Dict[str, Path]
+    manifest_path: Path
+
+
+class CSVPartitionError(Exception):
+    pass
+
+
+def default_max_open_files() -> int:
+    """A quarter of the soft fd limit, capped at 256."""
+    if resource is None:  # pragma: no cover
+        return 64
+    soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY or soft <= 0:
+        return 256
+    return max(1, min(256, soft // 4))
+
+
+class _WriterPool:
+    """LRU pool of open CSV append handles with per-partition row buffers.
+
+    Rows are buffered per partition and flushed in batches, so a partition
+    whose handle was evicted is reopened once per batch rather than once per
+    row. At most ``max_open`` files are open at any time.
+    """
+
+    def __init__(self, header: List[str], max_open: int, flush_rows: int, max_buffered_rows: int) -> None:
+        self.header = header
+        self.max_open = max_open
+        self.flush_rows = flush_rows
+        self.max_buffered_rows = max_buffered_rows
+        self._open: "OrderedDict[Path, Tuple[IO[str], Any]]" = OrderedDict()
+        self._buffers: Dict[Path, List[List[str]]] = {}
+        self._buffered = 0
+        self._created: set = set()
+
+    def append(self, path: Path, row: List[str]) -> None:
+        buf = self._buffers.setdefault(path, [])
+        buf.append(row)
+        self._buffered += 1
+        if len(buf) >= self.flush_rows:
+            self._flush(path)
+        elif self._buffered >= self.max_buffered_rows:
+            self.flush_all()
+
+    def _writer(self, path: Path) -> Any:
+        entry = self._open.get(path)
+        if entry is not None:
+            self._open.move_to_end(path)
+            return entry[1]
+        while len(self._open) >= self.max_open:
+            _evicted, (f, _w) = self._open.popitem(last=False)
+            f.close()
+        first_open = path not in self._created
+        f = path.open("w" if first_open else "a", encoding="utf-8", newline="")
+        writer = csv.writer(f)
+        if first_open:
+            writer.writerow(self.header)
+            self._created.add(path)
+        self._open[path] = (f, writer)
+        return writer
+
+    def _flush(self, path: Path) -> None:
+        buf = self._buffers.pop(path, None)
+        if not buf:
+            return
+        self._writer(path).writerows(buf)
+        self._buffered -= len(buf)
+
+    def flush_all(self) -> None:
+        for path in list(self._buffers):
+            self._flush(path)
+
+    def close(self) -> None:
+        try:
+            self.flush_all()
+        finally:
+            while self._open:
+                _path, (f, _w) = self._open.popitem(last=False)
+                f.close()
+
+
+class CSVPartitionerService:
+    def partition(
+        self,
+        input_file: Path,
+        output_dir: Path,
+        by: str,
+        overwrite: bool = False,
+        max_open_files: Optional[int] = None,
+        flush_rows: int = 512,
+        max_buffered_rows: int = 100_000,
+    ) -> PartitionResult:
+        if max_open_files is not None and max_open_files < 1:
+            raise CSVPartitionError(f"max_open_files must be at least 1, got {max_open_files}")
+        if not input_file.exists() or not input_file.is_file():
+            raise CSVPartitionError(f"Input file not found: {input_file}")
+        if output_dir.exists() and any(output_dir.iterdir()) and not overwrite:
+            raise CSVPartitionError(
+                f"Output directory is not empty: {output_dir}. Use --overwrite to write into it."
+            )
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        counts: Dict[str, int] = {}
+        files: Dict[str, Path] = {}
+        taken: Dict[str, str] = {}
+        rows_written = 0
+
+        with input_file.open("r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            try:
+                header = next(reader)
+            except StopIteration:
+                raise CSVPartitionError(f"File is empty (no header): {input_file}")
+            key_of = self._key_func(header, by)
+            pool = _WriterPool(header, max_open_files or default_max_open_files(), flush_rows, max_buffered_rows)
+            try:
+                for row in reader:
+                    if not row or all(cell == "" for cell in row):
+                        continue
+                    key = key_of(row)
+                    path = files.get(key)
+                    if path is None:
+                        path = output_dir / self._file_name(key, taken)
+                        files[key] = path
+                        counts[key] = 0
+                    pool.append(path, row)
+                    counts[key] += 1
+                    rows_written += 1
+            finally:
+                pool.close()
+
+        manifest_path = output_dir / MANIFEST_NAME
+        manifest = {
+            "input_file": str(input_file),
+            "by": by,
+            "rows_written": rows_written,
+            "partitions": {k: {"file": files[k].name, "rows": counts[k]} for k in sorted(counts)},
+        }
+        with manifest_path.open("w", encoding="utf-8") as mf:
+            json.dump(manifest, mf, indent=2)
+
+        return PartitionResult(
+            rows_written=rows_written,
+            partitions=counts,
+            files=files,
+            manifest_path=manifest_path,
+        )
+
+    def _key_func(self, header: List[str], by: str) -> Callable[[List[str]], str]:
+        if by in header:
+            i = header.index(by)
+            return lambda row: row[i].strip() if i < len(row) else ""
+        if by == ELECTION_CYCLE:
+            return self._cycle_key_func(header)
+        raise CSVPartitionError(f"Partition column '{by}' not found in input header")
+
+    def _cycle_key_func(self, header: List[str]) -> Callable[[List[str]], str]:
+        # Prefer the cycle FEC assigns; otherwise derive it from the receipt date
+        if "two_year_transaction_period" in header:
+            i = header.index("two_year_transaction_period")
+            return lambda row: row[i].strip() if i < len(row) else ""
+        if "contribution_receipt_date" not in header:
+            raise CSVPartitionError(
+                "Cannot derive election_cycle: need two_year_transaction_period or contribution_receipt_date"
+            )
+        i = header.index("contribution_receipt_date")
+
+        def key(row: List[str]) -> str:
+            dt = _parse_date(row[i]) if i < len(row) else None
+            if dt is None:
+                return ""
+            return str(dt.year + dt.year % 2)
+
+        return key
+
+    def _file_name(self, key: str, taken: Dict[str, str]) -> str:
+        stem = re.sub(r"[^A-Za-z0-9._-]+", "_", key).strip("._") or BLANK_KEY_NAME
+        name = f"{stem}.csv"
+        n = 1
+        # Distinct keys may sanitize to the same name; disambiguate with a suffix
+        while name in taken:
+            n += 1
+            name = f"{stem}-{n}.csv"
+        taken[name] = key
+        return name
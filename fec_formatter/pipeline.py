@@ -0,0 +1,156 @@
+"""Composable streaming stages for the FEC formatting pipeline.
+
+The stages mirror what ``fec-tools format-xlsx`` does, but can be used
+in-process: open a source, filter it with a compiled predicate, build output
+rows, sort them and hand them to any writer::
+
+    stream = open_source(path_or_file_or_rows)
+    predicate = builder.compile_filter(stream.header, names, ids, contains)
+    typed = build_rows(filter_rows(stream.rows, predicate), stream.header, builder.build_row)
+    write_rows(sort_rows(typed), writer, output)
+
+``FormatPipeline`` wires these stages together for the common case.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, Union
+
+from .config import AppConfig
+from .container import Container
+from .enrichment import MasterFileEnricher
+from .services import OUTPUT_COLUMNS, TypedRow, _parse_date, typed_row_sort_key
+
+
+Source = Union[Path, str, IO[str], Iterable[Sequence[str]]]
+RowBuildFn = Callable[[List[str], List[str]], List[str]]
+
+_DATE_INDEX = OUTPUT_COLUMNS.index("Contribution Date")
+
+
+class PipelineError(Exception):
+    pass
+
+
+class RowWriter(Protocol):
+    def write(self, rows_with_links: Iterable[Tuple[List[str], Optional[str]]], output_path: Any) -> None:
+        ...
+
+
+@dataclass
+class RowStream:
+    header: List[str]
+    rows: Iterator[List[str]]
+
+
+@dataclass(frozen=True)
+class FilterSpec:
+    names: Sequence[str] = ()
+    ids: Sequence[str] = ()
+    name_contains: Sequence[str] = ()
+
+
+def _iter_csv_path(path: Path) -> Iterator[List[str]]:
+    with path.open("r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f)
+
+
+def open_source(source: Source, header: Optional[Sequence[str]] = None) -> RowStream:
+    """Open a path, text file object or iterable of rows as a ``RowStream``.
+
+    Unless ``header`` is given, the first record is taken as the header.
+    Blank records are skipped.
+    """
+    records: Iterator[Sequence[str]]
+    if isinstance(source, (str, Path)):
+        records = _iter_csv_path(Path(source))
+    elif hasattr(source, "read"):
+        records = csv.reader(source)  # type: ignore[arg-type]
+    else:
+        records = iter(source)
+
+    if header is None:
+        try:
+            first = next(records)
+        except StopIteration:
+            raise PipelineError("Input is empty") from None
+        header = first
+    return RowStream(header=list(header), rows=(list(r) for r in records if r))
+
+
+def filter_rows(rows: Iterable[List[str]], predicate: Callable[[List[str]], bool]) -> Iterator[List[str]]:
+    for row in rows:
+        if predicate(row):
+            yield row
+
+
+def build_rows(rows: Iterable[List[str]], header: List[str], build: RowBuildFn) -> Iterator[TypedRow]:
+    """Turn source rows into ``(values, pdf_url, parsed_date)`` tuples."""
+    pdf_idx = header.index("pdf_url") if "pdf_url" in header else -1
+    for row in rows:
+        pdf_url = row[pdf_idx] if pdf_idx >= 0 and pdf_idx < len(row) else None
+        values = build(header, row)
+        yield (values, pdf_url, _parse_date(values[_DATE_INDEX]))
+
+
+def sort_rows(rows: Iterable[TypedRow]) -> List[TypedRow]:
+    """Sort reverse-chronologically by date, keeping undated rows last."""
+    return sorted(rows, key=typed_row_sort_key)
+
+
+def write_rows(rows: Iterable[TypedRow], writer: RowWriter, output: Any) -> int:
+    """Send rows to ``writer`` and return how many were written."""
+    count = 0
+
+    def strip() -> Iterator[Tuple[List[str], Optional[str]]]:
+        nonlocal count
+        for values, link, _dt in rows:
+            count += 1
+            yield (values, link)
+
+    writer.write(strip(), output)
+    return count
+
+
+@dataclass
+class FormatPipeline:
+    """Filter, build, sort and write FEC rows without going through the CLI."""
+
+    container: Container = field(default_factory=Container)
+    filters: FilterSpec = FilterSpec()
+    build: Optional[RowBuildFn] = None
+    enricher: Optional[MasterFileEnricher] = None
+
+    @classmethod
+    def from_config(cls, config: AppConfig, filters: FilterSpec = FilterSpec()) -> "FormatPipeline":
+        return cls(container=Container(config), filters=filters)
+
+    def iter_typed(self, source: Source, header: Optional[Sequence[str]] = None) -> Iterator[TypedRow]:
+        builder = self.container.create_row_builder()
+        stream = open_source(source, header)
+        predicate = builder.compile_filter(
+            stream.header, self.filters.names, self.filters.ids, self.filters.name_contains
+        )
+        build = self.build or builder.build_row
+        if self.enricher is not None:
+            build = self.enricher.build_with(build)
+        return build_rows(filter_rows(stream.rows, predicate), stream.header, build)
+
+    def run(
+        self,
+        source: Source,
+        output: Any,
+        writer: Optional[RowWriter] = None,
+        header: Optional[Sequence[str]] = None,
+    ) -> int:
+        """Process ``source`` into ``output`` and return the number of rows written.
+
+        ``writer`` defaults to the container's XLSX writer; ``output`` may be a
+        path or a binary file object.
+        """
+        extra_columns = self.enricher.columns if self.enricher is not None else ()
+        sink = writer or self.container.create_xlsx_writer(extra_columns)
+        return write_rows(sort_rows(self.iter_typed(source, header)), sink, output)
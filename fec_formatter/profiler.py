@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import base64
+import csv
+import hashlib
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .services import _parse_amount, _parse_date
+
+
+DISTINCT_COLUMNS = ("contributor_name", "contributor_id", "committee_id")
+DATE_COLUMN = "contribution_receipt_date"
+AMOUNT_COLUMN = "contribution_receipt_amount"
+REPORTED_QUANTILES = (0.01, 0.25, 0.5, 0.75, 0.9, 0.99)
+
+
+class ProfileError(Exception):
+    pass
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+@dataclass
+class HyperLogLog:
+    """Approximate distinct counter; registers merge by element-wise max.
+
+    With the default precision of 14 the standard error is about 0.8% using
+    16 KiB of registers, regardless of how many values are added.
+    """
+
+    precision: int = 14
+    registers: bytearray = field(default_factory=bytearray)
+
+    def __post_init__(self) -> None:
+        if not 4 <= self.precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18")
+        if not self.registers:
+            self.registers = bytearray(1 << self.precision)
+
+    def add(self, value: str) -> None:
+        h = _hash64(value)
+        p = self.precision
+        index = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        # Position of the leftmost 1-bit in the remaining 64 - p bits
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ProfileError("Cannot merge HyperLogLog sketches with different precision")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"precision": self.precision, "registers": base64.b64encode(bytes(self.registers)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HyperLogLog":
+        return cls(precision=data["precision"], registers=bytearray(base64.b64decode(data["registers"])))
+
+
+@dataclass
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error (DDSketch).
+
+    Values are counted in logarithmically sized buckets, so any reported
+    quantile is within ``relative_accuracy`` of the true value and merging
+    two sketches is a sum of bucket counts.
+    """
+
+    relative_accuracy: float = 0.01
+    positive: Dict[int, int] = field(default_factory=dict)
+    negative: Dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+    count: int = 0
+
+    def __post_init__(self) -> None:
+        self._gamma = (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+    def _key(self, magnitude: float) -> int:
+        return int(math.ceil(math.log(magnitude) / self._log_gamma))
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value > 0:
+            k = self._key(value)
+            self.positive[k] = self.positive.get(k, 0) + 1
+        elif value < 0:
+            k = self._key(-value)
+            self.negative[k] = self.negative.get(k, 0) + 1
+        else:
+            self.zero_count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ProfileError("Cannot merge quantile sketches with different accuracy")
+        for k, c in other.positive.items():
+            self.positive[k] = self.positive.get(k, 0) + c
+        for k, c in other.negative.items():
+            self.negative[k] = self.negative.get(k, 0) + c
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for k in sorted(self.negative, reverse=True):
+            seen += self.negative[k]
+            if seen > rank:
+                return -self._value(k)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for k in sorted(self.positive):
+            seen += self.positive[k]
+            if seen > rank:
+                return self._value(k)
+        return self._value(max(self.positive))  # pragma: no cover - rounding guard
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(k): c for k, c in self.positive.items()},
+            "negative": {str(k): c for k, c in self.negative.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "QuantileSketch":
+        return cls(
+            relative_accuracy=data["relative_accuracy"],
+            positive={int(k): c for k, c in data["positive"].items()},
+            negative={int(k): c for k, c in data["negative"].items()},
+            zero_count=data["zero_count"],
+            count=data["count"],
+        )
+
+
+@dataclass
+class DatasetProfile:
+    """Column statistics gathered in one pass; profiles of separate files merge."""
+
+    rows: int = 0
+    nulls: Dict[str, int] = field(default_factory=dict)
+    distinct: Dict[str, HyperLogLog] = field(default_factory=dict)
+    date_min: Optional[datetime] = None
+    date_max: Optional[datetime] = None
+    date_parse_failures: int = 0
+    amount_parse_failures: int = 0
+    amount_min: Optional[float] = None
+    amount_max: Optional[float] = None
+    amount_sum: float = 0.0
+    amounts: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add_rows(self, header: List[str], rows: Any) -> None:
+        columns = list(enumerate(header))
+        for col in header:
+            self.nulls.setdefault(col, 0)
+        distinct = [(header.index(c), self.distinct.setdefault(c, HyperLogLog())) for c in DISTINCT_COLUMNS if c in header]
+        date_idx = header.index(DATE_COLUMN) if DATE_COLUMN in header else -1
+        amount_idx = header.index(AMOUNT_COLUMN) if AMOUNT_COLUMN in header else -1
+        nulls = self.nulls
+
+        for row in rows:
+            if not row:
+                continue
+            self.rows += 1
+            n = len(row)
+            for i, col in columns:
+                if i >= n or not row[i].strip():
+                    nulls[col] += 1
+            for i, hll in distinct:
+                if i < n and row[i]:
+                    hll.add(row[i])
+            if 0 <= date_idx < n and row[date_idx].strip():
+                self._add_date(row[date_idx])
+            if 0 <= amount_idx < n and row[amount_idx].strip():
+                self._add_amount(row[amount_idx])
+
+    def _add_date(self, raw: str) -> None:
+        dt = _parse_date(raw)
+        if dt is None:
+            self.date_parse_failures += 1
+            return
+        if self.date_min is None or dt < self.date_min:
+            self.date_min = dt
+        if self.date_max is None or dt > self.date_max:
+            self.date_max = dt
+
+    def _add_amount(self, raw: str) -> None:
+        amount = _parse_amount(raw)
+        if amount is None:
+            self.amount_parse_failures += 1
+            return
+        self.amounts.add(amount)
+        self.amount_sum += amount
+        if self.amount_min is None or amount < self.amount_min:
+            self.amount_min = amount
+        if self.amount_max is None or amount > self.amount_max:
+            self.amount_max = amount
+
+    def merge(self, other: "DatasetProfile") -> None:
+        self.rows += other.rows
+        for col, c in other.nulls.items():
+            # A column missing from one file counts as null for all its rows
+            self.nulls[col] = self.nulls.get(col, self.rows - other.rows) + c
+        for col in self.nulls:
+            if col not in other.nulls:
+                self.nulls[col] += other.rows
+        for col, hll in other.distinct.items():
+            if col in self.distinct:
+                self.distinct[col].merge(hll)
+            else:
+                self.distinct[col] = HyperLogLog.from_dict(hll.to_dict())
+        self.date_min = _min_opt(self.date_min, other.date_min)
+        self.date_max = _max_opt(self.date_max, other.date_max)
+        self.date_parse_failures += other.date_parse_failures
+        self.amount_parse_failures += other.amount_parse_failures
+        self.amount_min = _min_opt(self.amount_min, other.amount_min)
+        self.amount_max = _max_opt(self.amount_max, other.amount_max)
+        self.amount_sum += other.amount_sum
+        self.amounts.merge(other.amounts)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "null_rates": {c: (n / self.rows if self.rows else 0.0) for c, n in self.nulls.items()},
+            "distinct_estimates": {c: hll.estimate() for c, hll in self.distinct.items()},
+            "date_range": {
+                "min": self.date_min.isoformat() if self.date_min else None,
+                "max": self.date_max.isoformat() if self.date_max else None,
+            },
+            "date_parse_failures": self.date_parse_failures,
+            "amount": {
+                "count": self.amounts.count,
+                "min": self.amount_min,
+                "max": self.amount_max,
+                "sum": round(self.amount_sum, 2),
+                "quantiles": {str(q): self.amounts.quantile(q) for q in REPORTED_QUANTILES},
+            },
+            "amount_parse_failures": self.amount_parse_failures,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize including the sketches, so saved profiles can be merged later."""
+        return {
+            "summary": self.summary(),
+            "state": {
+                "rows": self.rows,
+                "nulls": self.nulls,
+                "distinct": {c: hll.to_dict() for c, hll in self.distinct.items()},
+                "date_min": self.date_min.isoformat() if self.date_min else None,
+                "date_max": self.date_max.isoformat() if self.date_max else None,
+                "date_parse_failures": self.date_parse_failures,
+                "amount_parse_failures": self.amount_parse_failures,
+                "amount_min": self.amount_min,
+                "amount_max": self.amount_max,
+                "amount_sum": self.amount_sum,
+                "amounts": self.amounts.to_dict(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DatasetProfile":
+        try:
+            s = data["state"]
+            return cls(
+                rows=s["rows"],
+                nulls=dict(s["nulls"]),
+                distinct={c: HyperLogLog.from_dict(h) for c, h in s["distinct"].items()},
+                date_min=datetime.fromisoformat(s["date_min"]) if s["date_min"] else None,
+                date_max=datetime.fromisoformat(s["date_max"]) if s["date_max"] else None,
+                date_parse_failures=s["date_parse_failures"],
+                amount_parse_failures=s["amount_parse_failures"],
+                amount_min=s["amount_min"],
+                amount_max=s["amount_max"],
+                amount_sum=s["amount_sum"],
+                amounts=QuantileSketch.from_dict(s["amounts"]),
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ProfileError("Not a saved fec-tools profile") from exc
+
+
+def _min_opt(a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return min(a, b)
+
+
+def _max_opt(a: Any, b: Any) -> Any:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return max(a, b)
+
+
+def _profile_file_dict(path: Path) -> Dict[str, Any]:
+    # Module-level so it can run in a worker process
+    return CSVProfilerService().profile_file(path).to_dict()
+
+
+class CSVProfilerService:
+    def profile_file(self, input_file: Path) -> DatasetProfile:
+        with input_file.open("r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            try:
+                header = next(reader)
+            except StopIteration:
+                raise ProfileError(f"File is empty (no header): {input_file}")
+            profile = DatasetProfile()
+            profile.add_rows(header, reader)
+        return profile
+
+    def profile(self, input_files: Sequence[Path], workers: int = 1) -> DatasetProfile:
+        """Profile each file (in parallel when ``workers`` > 1) and merge the results."""
+        if workers > 1 and len(input_files) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = [DatasetProfile.from_dict(d) for d in pool.map(_profile_file_dict, input_files)]
+        else:
+            parts = [self.profile_file(p) for p in input_files]
+        merged = DatasetProfile()
+        for part in parts:
+            merged.merge(part)
+        return merged
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Generic, Iterable, List, Optional, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+# How many rows to scan between time-budget checks
+_CLOCK_CHECK_INTERVAL = 1024
+
+
+@dataclass
+class ReservoirSampler(Generic[T]):
+    """Uniform fixed-size sample of a stream in O(size) memory.
+
+    Uses Li's Algorithm L, which draws how many items to skip before the
+    next replacement instead of a random number per item.
+    """
+
+    size: int
+    rng: random.Random = field(default_factory=random.Random)
+    items: List[T] = field(default_factory=list)
+    seen: int = 0
+
+    def __post_init__(self) -> None:
+        if self.size < 1:
+            raise ValueError("Sample size must be at least 1")
+        self._w = math.exp(math.log(self._uniform()) / self.size)
+        self._next = self.size + self._skip()
+
+    def _uniform(self) -> float:
+        # random() may return 0.0; shift into (0, 1] so log() is defined
+        return 1.0 - self.rng.random()
+
+    def _skip(self) -> int:
+        return int(math.floor(math.log(self._uniform()) / math.log1p(-self._w))) + 1 if self._w < 1.0 else 1
+
+    def offer(self, item: T) -> None:
+        self.seen += 1
+        if len(self.items) < self.size:
+            self.items.append(item)
+            return
+        if self.seen == self._next:
+            self.items[self.rng.randrange(self.size)] = item
+            self._w *= math.exp(math.log(self._uniform()) / self.size)
+            self._next += self._skip()
+
+
+@dataclass(frozen=True)
+class SampleResult:
+    rows: List[List[str]]
+    rows_scanned: int
+    rows_matched: int
+    bytes_read: int
+    total_bytes: Optional[int]
+    complete: bool
+
+    @property
+    def estimated_matches(self) -> int:
+        """Exact match count for a complete pass, otherwise extrapolated by bytes read."""
+        if self.complete or not self.total_bytes or not self.bytes_read:
+            return self.rows_matched
+        return int(round(self.rows_matched * self.total_bytes / self.bytes_read))
+
+
+def sample_matching_rows(
+    records: Iterable[Tuple[List[str], int]],
+    predicate: Callable[[List[str]], bool],
+    size: int,
+    seed: Optional[int] = None,
+    total_bytes: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    max_seconds: Optional[float] = None,
+) -> SampleResult:
+    """Filter ``(row, end_offset)`` records while keeping a reservoir sample of matches.
+
+    Scanning stops early once ``max_bytes`` have been read or ``max_seconds``
+    have elapsed; the result then reports an estimated match count.
+    """
+    sampler: ReservoirSampler[List[str]] = ReservoirSampler(size, random.Random(seed))
+    scanned = 0
+    matched = 0
+    bytes_read = 0
+    complete = True
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    for row, offset in records:
+        bytes_read = offset
+        if not row:
+            continue
+        scanned += 1
+        if predicate(row):
+            matched += 1
+            sampler.offer(row)
+        if max_bytes is not None and bytes_read >= max_bytes:
+            complete = total_bytes is not None and bytes_read >= total_bytes
+            break
+        if deadline is not None and scanned % _CLOCK_CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+            complete = False
+            break
+    return SampleResult(
+        rows=sampler.items,
+        rows_scanned=scanned,
+        rows_matched=matched,
+        bytes_read=bytes_read,
+        total_bytes=total_bytes,
+        complete=complete,
+    )
@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import socketserver
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .container import Container
+from .pipeline import RowBuildFn, build_rows, sort_rows
+from .services import OUTPUT_COLUMNS, _norm
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+_LATENCY_WINDOW = 1000
+
+
+class ServeError(Exception):
+    pass
+
+
+class DatasetUnavailableError(ServeError):
+    """A configured dataset's file can no longer be read."""
+
+
+@dataclass
+class Dataset:
+    """A CSV held in memory with lookup indexes for the contributor filters.
+
+    Exact name and id filters are answered from hash indexes; substring
+    filters scan a precomputed list of normalized names.
+    """
+
+    name: str
+    path: Path
+    header: List[str]
+    rows: List[List[str]]
+    stat_key: Tuple[int, int]
+    loaded_at: float
+    names_norm: List[str] = field(default_factory=list)
+    by_name: Dict[str, List[int]] = field(default_factory=dict)
+    by_id: Dict[str, List[int]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, name: str, path: Path) -> "Dataset":
+        st = path.stat()
+        with path.open("r", encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            try:
+                header = next(reader)
+            except StopIteration:
+                raise ServeError(f"Dataset file is empty: {path}")
+            rows = [row for row in reader if row]
+        ds = cls(name=name, path=path, header=header, rows=rows, stat_key=(st.st_size, st.st_mtime_ns), loaded_at=time.time())
+        ds._index()
+        return ds
+
+    def _index(self) -> None:
+        name_idx = self.header.index("contributor_name") if "contributor_name" in self.header else -1
+        id_idx = self.header.index("contributor_id") if "contributor_id" in self.header else -1
+        for i, row in enumerate(self.rows):
+            name = _norm(row[name_idx]) if 0 <= name_idx < len(row) else ""
+            self.names_norm.append(name)
+            self.by_name.setdefault(name, []).append(i)
+            if 0 <= id_idx < len(row):
+                self.by_id.setdefault(_norm(row[id_idx]), []).append(i)
+
+    def query(self, names: Sequence[str], ids: Sequence[str], name_contains: Sequence[str]) -> List[List[str]]:
+        """Rows matching any filter (all rows when no filter is given), in file order."""
+        if not names and not ids and not name_contains:
+            return self.rows
+        hits: set = set()
+        for n in names:
+            hits.update(self.by_name.get(_norm(n), ()))
+        for i in ids:
+            hits.update(self.by_id.get(_norm(i), ()))
+        contains = [_norm(c) for c in name_contains]
+        if contains:
+            hits.update(i for i, v in enumerate(self.names_norm) if any(c in v for c in contains))
+        return [self.rows[i] for i in sorted(hits)]
+
+
+class DatasetRegistry:
+    """Named datasets, reloaded transparently when their file changes on disk.
+
+    A reload parses the file under that dataset's own lock and only takes the
+    registry lock to publish the result, so other datasets keep serving.
+    """
+
+    def __init__(self, paths: Dict[str, Path]) -> None:
+        self._paths = dict(paths)
+        self._lock = threading.Lock()
+        self._reload_locks = {name: threading.Lock() for name in self._paths}
+        self._datasets: Dict[str, Dataset] = {name: Dataset.load(name, p) for name, p in self._paths.items()}
+        self.reloads = 0
+
+    def names(self) -> List[str]:
+        return sorted(self._paths)
+
+    def get(self, name: str) -> Dataset:
+        if name not in self._paths:
+            raise KeyError(name)
+        path = self._paths[name]
+        try:
+            st = path.stat()
+            stat_key = (st.st_size, st.st_mtime_ns)
+            with self._lock:
+                ds = self._datasets[name]
+            if ds.stat_key == stat_key:
+                return ds
+            with self._reload_locks[name]:
+                with self._lock:
+                    ds = self._datasets[name]
+                if ds.stat_key != stat_key:
+                    ds = Dataset.load(name, path)
+                    with self._lock:
+                        self._datasets[name] = ds
+                        self.reloads += 1
+                return ds
+        except (OSError, ServeError) as exc:
+            raise DatasetUnavailableError(f"Dataset {name} is unavailable: {exc}") from exc
+
+
+class ServerStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.rows_served = 0
+        self._latencies: Deque[float] = deque(maxlen=_LATENCY_WINDOW)
+
+    def record(self, seconds: float, rows: int, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += int(error)
+            self.rows_served += rows
+            self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            uptime = time.monotonic() - self.started_at
+
+            def pct(q: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+            return {
+                "uptime_seconds": round(uptime, 3),
+                "requests": self.requests,
+                "errors": self.errors,
+                "rows_served": self.rows_served,
+                "requests_per_second": round(self.requests / uptime, 3) if uptime > 0 else 0.0,
+                "latency_ms": {"p50": pct(0.5), "p95": pct(0.95), "max": pct(1.0)},
+            }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "fec-tools"
+    app: "FECServer"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+        # Per-request accounting goes to /stats instead of stderr
+        pass
+
+    def address_string(self) -> str:
+        # Unix-socket peers have no (host, port) address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any) -> None:
+        self._send(status, json.dumps(payload).encode("utf-8"), "application/json")
+
+    def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+        if self.path == "/stats":
+            payload = self.app.stats.snapshot()
+            payload["reloads"] = self.app.registry.reloads
+            self._send_json(200, payload)
+        elif self.path == "/datasets":
+            datasets = []
+            for name in self.app.registry.names():
+                try:
+                    ds = self.app.registry.get(name)
+                except DatasetUnavailableError as exc:
+                    datasets.append({"name": name, "error": str(exc)})
+                    continue
+                datasets.append({"name": name, "path": str(ds.path), "rows": len(ds.rows), "loaded_at": ds.loaded_at})
+            self._send_json(200, {"datasets": datasets})
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+        started = time.perf_counter()
+        rows = 0
+        error = True
+        try:
+            if self.path != "/format":
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", "0"))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                status, body, content_type, rows = self.app.handle_format(request)
+            except DatasetUnavailableError as exc:
+                self._send_json(503, {"error": str(exc)})
+                return
+            except (ValueError, ServeError) as exc:
+                self._send_json(400, {"error": str(exc)})
+                return
+            self._send(status, body, content_type)
+            error = status >= 400
+        finally:
+            self.app.stats.record(time.perf_counter() - started, rows, error)
+
+
+class _ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class FECServer:
+    """Local HTTP service answering filter/format requests from warm datasets.
+
+    ``POST /format`` takes a JSON body with ``dataset`` and the optional
+    ``contributor_names``, ``contributor_ids``, ``contributor_name_contains``
+    lists and ``format`` (``"xlsx"`` or ``"json"``). ``GET /datasets`` and
+    ``GET /stats`` report loaded datasets and latency/throughput figures.
+    """
+
+    def __init__(
+        self,
+        datasets: Dict[str, Path],
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        unix_socket: Optional[Path] = None,
+        container: Optional[Container] = None,
+        build: Optional[RowBuildFn] = None,
+    ) -> None:
+        self.container = container or Container()
+        self.build = build or self.container.create_row_builder().build_row
+        self.registry = DatasetRegistry(datasets)
+        self.stats = ServerStats()
+        handler = type("Handler", (_Handler,), {"app": self})
+        self.httpd: socketserver.BaseServer
+        if unix_socket is not None:
+            # Only a stale socket may be replaced; never delete a regular file
+            if unix_socket.is_socket():
+                unix_socket.unlink()
+            elif unix_socket.exists():
+                raise ServeError(f"Refusing to replace non-socket path: {unix_socket}")
+            self.httpd = _ThreadingUnixHTTPServer(str(unix_socket), handler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.unix_socket = unix_socket
+
+    @property
+    def address(self) -> str:
+        if self.unix_socket is not None:
+            return f"unix:{self.unix_socket}"
+        host, port = self.httpd.server_address[:2]  # type: ignore[misc]
+        return f"http://{host}:{port}"
+
+    def handle_format(self, request: Any) -> Tuple[int, bytes, str, int]:
+        if not isinstance(request, dict):
+            raise ServeError("Request body must be a JSON object")
+
+        def strings(key: str) -> List[str]:
+            value = request.get(key) or []
+            if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+                raise ServeError(f"'{key}' must be a list of strings")
+            return value
+
+        name = request.get("dataset")
+        if not isinstance(name, str):
+            raise ServeError("'dataset' is required")
+        try:
+            ds = self.registry.get(name)
+        except KeyError:
+            return 404, json.dumps({"error": f"Unknown dataset: {name}"}).encode("utf-8"), "application/json", 0
+        matched = ds.query(strings("contributor_names"), strings("contributor_ids"), strings("contributor_name_contains"))
+        typed = sort_rows(build_rows(matched, ds.header, self.build))
+        out_format = request.get("format", "xlsx")
+        if out_format == "json":
+            payload = {"columns": OUTPUT_COLUMNS, "rows": [[v, link] for v, link, _dt in typed]}
+            return 200, json.dumps(payload).encode("utf-8"), "application/json", len(typed)
+        if out_format != "xlsx":
+            raise ServeError(f"Unsupported format: {out_format}")
+        buf = io.BytesIO()
+        self.container.create_xlsx_writer().write([(v, link) for v, link, _dt in typed], buf)
+        content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        return 200, buf.getvalue(), content_type, len(typed)
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.unix_socket is not None and self.unix_socket.is_socket():
+            self.unix_socket.unlink()
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import csv
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import IO, Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .config import StyleConfig
 
@@ -24,6 +24,16 @@ OUTPUT_COLUMNS = [
     "FEC ID",
 ]
 
+# Output values, optional hyperlink, and parsed contribution date
+TypedRow = Tuple[List[str], Optional[str], Optional[datetime]]
+
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _norm(s: str) -> str:
+    # Normalize case and collapse whitespace for robust matching
+    return " ".join((s or "").split()).casefold()
+
 
 @dataclass
 class FECRowBuilder:
@@ -35,9 +45,19 @@ class FECRowBuilder:
         ids: Sequence[str],
         name_contains: Sequence[str] = (),
     ) -> bool:
+        return self.compile_filter(header, names, ids, name_contains)(row)
+
+    def compile_filter(
+        self,
+        header: List[str],
+        names: Sequence[str],
+        ids: Sequence[str],
+        name_contains: Sequence[str] = (),
+    ) -> Callable[[List[str]], bool]:
+        """Return a row predicate with column lookups and normalization done once."""
         if not names and not ids:
             if not name_contains:
-                return True
+                return lambda row: True
 
         def idx(col: str) -> int:
             try:
@@ -45,25 +65,24 @@ class FECRowBuilder:
             except ValueError:
                 return -1
 
-        def norm(s: str) -> str:
-            # Normalize case and collapse whitespace for robust matching
-            return " ".join((s or "").split()).casefold()
-
         name_idx = idx("contributor_name")
         id_idx = idx("contributor_id")
 
-        name_set = {norm(n) for n in names}
-        id_set = {norm(i) for i in ids}
-        contains_list = [norm(c) for c in name_contains]
+        name_set = {_norm(n) for n in names}
+        id_set = {_norm(i) for i in ids}
+        contains_list = [_norm(c) for c in name_contains]
+
+        def predicate(row: List[str]) -> bool:
+            name_val = _norm(row[name_idx]) if name_idx >= 0 and name_idx < len(row) else ""
+            id_val = _norm(row[id_idx]) if id_idx >= 0 and id_idx < len(row) else ""
 
-        name_val = norm(row[name_idx]) if name_idx >= 0 and name_idx < len(row) else ""
-        id_val = norm(row[id_idx]) if id_idx >= 0 and id_idx < len(row) else ""
+            name_match = bool(name_set) and name_val in name_set
+            id_match = bool(id_set) and id_val in id_set
+            contains_match = bool(contains_list) and any(c in name_val for c in contains_list)
 
-        name_match = bool(name_set) and name_val in name_set
-        id_match = bool(id_set) and id_val in id_set
-        contains_match = bool(contains_list) and any(c in name_val for c in contains_list)
+            return name_match or id_match or contains_match
 
-        return name_match or id_match or contains_match
+        return predicate
 
     def build_row(self, header: List[str], row: List[str]) -> List[str]:
         def get(col: str) -> str:
@@ -84,7 +103,8 @@ class FECRowBuilder:
 
         street = ", ".join([p for p in [get('contributor_street_1'), get('contributor_street_2')] if p]).strip(', ')
         city_state = ", ".join([p for p in [get('contributor_city'), get('contributor_state')] if p]).strip(', ')
-        address = f"{street}, {city_state} {get('contributor_zip')}".strip()
+        base = f"{street}, {city_state}" if street and city_state else street or city_state
+        address = f"{base} {get('contributor_zip')}".strip()
 
         employer = get('contributor_employer')
         occupation = get('contributor_occupation')
@@ -103,9 +123,13 @@ class FECRowBuilder:
 @dataclass
 class XLSXWriterService:
     style: StyleConfig
+    # Optional columns appended after OUTPUT_COLUMNS (e.g. master-file enrichment)
+    extra_columns: Sequence[str] = ()
 
-    def write(self, rows_with_links: Iterable[Tuple[List[str], Optional[str]]], output_path: Path) -> None:
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+    def write(self, rows_with_links: Iterable[Tuple[List[str], Optional[str]]], output_path: Union[Path, IO[bytes]]) -> None:
+        # Binary file objects are accepted so callers can render in memory
+        if isinstance(output_path, Path):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
         wb = Workbook()
         ws: Worksheet = wb.active
         ws.title = "FEC"
@@ -122,8 +146,9 @@ class XLSXWriterService:
         border = Border(left=side, right=side, top=side, bottom=side)
 
         # Write header
-        ws.append(OUTPUT_COLUMNS)
-        for col_idx in range(1, len(OUTPUT_COLUMNS) + 1):
+        columns = list(OUTPUT_COLUMNS) + list(self.extra_columns)
+        ws.append(columns)
+        for col_idx in range(1, len(columns) + 1):
             cell = ws.cell(row=1, column=col_idx)
             cell.font = header_font
             cell.fill = header_fill
@@ -137,7 +162,7 @@ class XLSXWriterService:
         for row_values, link in rows_with_links:
             ws.append(row_values)
             # Apply base font and borders
-            for col_idx in range(1, len(OUTPUT_COLUMNS) + 1):
+            for col_idx in range(1, len(columns) + 1):
                 cell = ws.cell(row=row_idx, column=col_idx)
                 cell.font = base_font
                 cell.border = border
@@ -231,3 +256,14 @@ def _parse_date(raw: str) -> Optional[datetime]:
     return None
 
 
+
+
+def typed_row_sort_key(row: TypedRow, seq: int = 0) -> Tuple[int, int, int]:
+    """Sort key for reverse-chronological order with undated rows last.
+
+    ``seq`` breaks ties so the order is identical to a stable sort by date.
+    """
+    dt = row[2]
+    if dt is None:
+        return (1, 0, seq)
+    return (0, -((dt - datetime.min) // _ONE_MICROSECOND), seq)
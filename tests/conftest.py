@@ -3,6 +3,14 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_output_cache(tmp_path_factory, monkeypatch):  # type: ignore[no-untyped-def]
+    """Keep the format-xlsx output cache out of the user's home directory."""
+    monkeypatch.setenv("FEC_TOOLS_CACHE_DIR", str(tmp_path_factory.mktemp("fec-cache")))
+
 
 def pytest_sessionfinish(session, exitstatus):  # type: ignore[no-untyped-def]
     """Enforce per-file coverage ≥ 80% for fec_formatter/*.
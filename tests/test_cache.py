@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import csv
+import os
+from pathlib import Path
+
+import pytest
+
+from fec_formatter import cli
+from fec_formatter.cache import OutputCache
+from fec_formatter.cli import Args, run_format
+
+
+def _write_input(path: Path) -> None:
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["contributor_name", "contribution_receipt_date"])
+        w.writerow(["Realtors PAC", "2024-01-01"])
+        w.writerow(["Other", "2024-02-01"])
+
+
+def test_format_cache_hit_skips_render(tmp_path: Path, monkeypatch, capsys):
+    src = tmp_path / "in.csv"
+    _write_input(src)
+    cache_dir = tmp_path / "cache"
+
+    def args(out: Path, names=(), **kw) -> Args:
+        return Args(input_file=src, contributor_names=names, contributor_ids=(), output_path=out, cache_dir=cache_dir, **kw)
+
+    first = tmp_path / "first.xlsx"
+    run_format(args(first, names=("realtors pac",)))
+    assert "(cached)" not in capsys.readouterr().out
+
+    def fail(*_a, **_kw):  # type: ignore[no-untyped-def]
+        raise AssertionError("should have been served from cache")
+
+    # Same request with differently normalized filter values is a hit
+    monkeypatch.setattr(cli, "write_xlsx", fail)
+    second = tmp_path / "second.xlsx"
+    run_format(args(second, names=("  Realtors   PAC",)))
+    assert "Wrote 1 rows" in capsys.readouterr().out
+    assert second.read_bytes() == first.read_bytes()
+    monkeypatch.undo()
+
+    # --no-cache and changed input both re-render
+    run_format(args(tmp_path / "third.xlsx", names=("realtors pac",), no_cache=True))
+    with src.open("a", encoding="utf-8", newline="") as f:
+        f.write("Realtors PAC,2024-03-01\n")
+    run_format(args(tmp_path / "fourth.xlsx", names=("realtors pac",)))
+    out = capsys.readouterr().out
+    assert "(cached)" not in out
+    assert "Wrote 2 rows" in out
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = OutputCache(tmp_path / "cache", max_bytes=250)
+    artifacts = []
+    for i in range(3):
+        a = tmp_path / f"a{i}.xlsx"
+        a.write_bytes(bytes([i]) * 100)
+        artifacts.append(a)
+
+    cache.store("k0", artifacts[0], {"rows": 0})
+    cache.store("k1", artifacts[1], {"rows": 1})
+    entry0 = tmp_path / "cache" / "k0.xlsx"
+    os.utime(entry0, ns=(0, 0))
+    os.utime(tmp_path / "cache" / "k1.xlsx", ns=(1, 1))
+    # A hit refreshes k0, so k1 becomes the eviction victim
+    assert cache.fetch("k0", tmp_path / "out.xlsx") == {"rows": 0}
+    cache.store("k2", artifacts[2], {"rows": 2})
+    assert cache.fetch("k1", tmp_path / "out1.xlsx") is None
+    assert cache.fetch("k2", tmp_path / "out2.xlsx") == {"rows": 2}
+    assert (tmp_path / "out.xlsx").read_bytes() == artifacts[0].read_bytes()
+
+
+def test_editing_a_fetched_output_leaves_the_entry_intact(tmp_path: Path):
+    from openpyxl import load_workbook
+
+    src = tmp_path / "in.csv"
+    _write_input(src)
+    cache_dir = tmp_path / "cache"
+
+    def run(out: Path) -> Path:
+        return run_format(Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=out, cache_dir=cache_dir))
+
+    run(tmp_path / "one.xlsx")
+    two = run(tmp_path / "two.xlsx")
+    wb = load_workbook(two)
+    wb.active["A2"] = "EDITED"
+    wb.save(two)
+    three = run(tmp_path / "three.xlsx")
+    assert load_workbook(three).active["A2"].value != "EDITED"
+    assert three.read_bytes() == (tmp_path / "one.xlsx").read_bytes()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_first_run_hashes_inputs_while_streaming(tmp_path: Path, monkeypatch, capsys, workers: int):
+    inputs = [tmp_path / "a.csv", tmp_path / "b.csv"]
+    for p in inputs:
+        _write_input(p)
+    cache_dir = tmp_path / "cache"
+
+    def args(out: Path) -> Args:
+        return Args(
+            input_file=Path(""), contributor_names=(), contributor_ids=(), output_path=out,
+            cache_dir=cache_dir, input_files=tuple(inputs), workers=workers,
+        )
+
+    def no_second_read(self, path):  # type: ignore[no-untyped-def]
+        raise AssertionError(f"{path} was read again just to hash it")
+
+    monkeypatch.setattr(OutputCache, "content_hash", no_second_read)
+    run_format(args(tmp_path / "first.xlsx"))
+    assert "(cached)" not in capsys.readouterr().out
+    run_format(args(tmp_path / "second.xlsx"))
+    assert "(cached)" in capsys.readouterr().out
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter import cli
+from fec_formatter.checkpoint import CheckpointError, checkpoint_path_for
+from fec_formatter.cli import Args, run_format
+from fec_formatter.combiner import CSVCombineError, CSVCombinerService
+from fec_formatter.readers import iter_csv_rows_with_offsets
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _write_csv(path: Path, header: list[str], rows: list[list[str]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+class _CrashingCombiner(CSVCombinerService):
+    def __init__(self, crash_after: int) -> None:
+        self.crash_after = crash_after
+
+    def _iter_rows_with_offsets(self, file_path, start_offset):  # type: ignore[no-untyped-def]
+        for item in super()._iter_rows_with_offsets(file_path, start_offset):
+            if self.crash_after == 0:
+                raise _Interrupted()
+            self.crash_after -= 1
+            yield item
+
+
+def test_offsets_resume_mid_file(tmp_path: Path):
+    src = tmp_path / "in.csv"
+    _write_csv(src, ["a", "b"], [["1", "multi\nline"], ["3", "4"], ["5", "6"]])
+    records = list(iter_csv_rows_with_offsets(src))
+    assert records[1][0] == ["1", "multi\nline"]
+    resumed = list(iter_csv_rows_with_offsets(src, records[1][1]))
+    assert [r for r, _ in resumed] == [["3", "4"], ["5", "6"]]
+
+
+def test_combine_resume_is_byte_identical(tmp_path: Path):
+    d = tmp_path / "in"
+    header = ["a", "b"]
+    _write_csv(d / "one.csv", header, [[str(i), "x"] for i in range(5)])
+    _write_csv(d / "two.csv", header, [[str(i), "y,\"q\""] for i in range(5, 12)])
+
+    expected = tmp_path / "expected.csv"
+    CSVCombinerService().combine(d, expected)
+
+    out = tmp_path / "out.csv"
+    with pytest.raises(_Interrupted):
+        _CrashingCombiner(crash_after=8).combine(d, out, checkpoint=True, checkpoint_every=3)
+    assert not out.exists()
+    assert checkpoint_path_for(out).exists()
+
+    result = CSVCombinerService().combine(d, out, resume=True, checkpoint_every=3)
+    assert result.rows_written == 12
+    assert result.files_combined == 2
+    assert out.read_bytes() == expected.read_bytes()
+    assert not checkpoint_path_for(out).exists()
+
+
+def test_combine_resume_rejects_changed_inputs(tmp_path: Path):
+    d = tmp_path / "in"
+    _write_csv(d / "one.csv", ["a"], [["1"], ["2"], ["3"]])
+    out = tmp_path / "out.csv"
+    with pytest.raises(_Interrupted):
+        _CrashingCombiner(crash_after=1).combine(d, out, checkpoint=True, checkpoint_every=1)
+    _write_csv(d / "one.csv", ["a"], [["1"], ["2"], ["3"], ["4"]])
+    with pytest.raises(CheckpointError):
+        CSVCombinerService().combine(d, out, resume=True)
+
+
+def test_format_resume_matches_uninterrupted(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    header = ["committee_name", "committee_id", "contributor_name", "contribution_receipt_date", "image_number"]
+    rows = [["C", "C1", f"N{i}", f"2024-01-{(i % 5) + 1:02d}" if i % 4 else "", f"IMG{i}"] for i in range(20)]
+    src = tmp_path / "in.csv"
+    _write_csv(src, header, rows)
+
+    expected = tmp_path / "expected.xlsx"
+    run_format(Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=expected, no_cache=True))
+
+    real_iter = cli.iter_csv_rows_with_offsets
+
+    def crashing_iter(path, start_offset=0):  # type: ignore[no-untyped-def]
+        for n, item in enumerate(real_iter(path, start_offset)):
+            if n == 13:
+                raise _Interrupted()
+            yield item
+
+    out = tmp_path / "out.xlsx"
+    args = Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=out, checkpoint=True, checkpoint_every=4, no_cache=True)
+    monkeypatch.setattr(cli, "iter_csv_rows_with_offsets", crashing_iter)
+    with pytest.raises(_Interrupted):
+        run_format(args)
+    monkeypatch.setattr(cli, "iter_csv_rows_with_offsets", real_iter)
+
+    args.resume = True
+    run_format(args)
+    assert not checkpoint_path_for(out).exists()
+
+    def values(path: Path):
+        return [[c.value for c in r] for r in load_workbook(path).active.iter_rows()]
+
+    assert values(out) == values(expected)
+
+
+def test_checkpoint_every_must_be_positive(tmp_path: Path):
+    d = tmp_path / "in"
+    _write_csv(d / "one.csv", ["a"], [["1"]])
+    out = tmp_path / "out.csv"
+    with pytest.raises(CSVCombineError):
+        CSVCombinerService().combine(d, out, checkpoint=True, checkpoint_every=0)
+    assert not out.with_suffix(".csv.tmp").exists()
+
+    args = Args(input_file=d / "one.csv", contributor_names=(), contributor_ids=(), output_path=tmp_path / "o.xlsx", checkpoint=True, checkpoint_every=0, no_cache=True)
+    with pytest.raises(SystemExit, match=r"\[ERROR\] --checkpoint-every"):
+        run_format(args)
+
+
+def test_mismatched_checkpoint_is_a_cli_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    d = tmp_path / "in"
+    _write_csv(d / "one.csv", ["a"], [["1"], ["2"], ["3"]])
+    out = tmp_path / "out.csv"
+    with pytest.raises(_Interrupted):
+        _CrashingCombiner(crash_after=1).combine(d, out, checkpoint=True, checkpoint_every=1)
+    _write_csv(d / "one.csv", ["a"], [["1"], ["2"], ["3"], ["4"]])
+    monkeypatch.setattr("sys.argv", ["fec-tools", "combine", "--input-dir", str(d), "--output", str(out), "--resume"])
+    with pytest.raises(SystemExit, match=r"\[ERROR\] Checkpoint .* does not match"):
+        cli.main()
+
+    src = d / "one.csv"
+    xlsx = tmp_path / "o.xlsx"
+    checkpoint_path_for(xlsx).write_text('{"kind": "format", "inputs": []}', encoding="utf-8")
+    args = Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=xlsx, resume=True, no_cache=True)
+    with pytest.raises(SystemExit, match=r"\[ERROR\] Checkpoint .* does not match"):
+        run_format(args)
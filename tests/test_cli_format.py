@@ -31,3 +31,21 @@ def test_run_format_basic(tmp_path: Path):
     assert out.exists()
 
 
+
+
+def test_main_in_process(tmp_path: Path, monkeypatch):
+    import sys
+    from fec_formatter.cli import main
+
+    d = tmp_path / "d"; d.mkdir()
+    (d / "a.csv").write_text("contributor_name,contribution_receipt_date\nA,2024-01-01\n", encoding="utf-8")
+    (d / "b.csv").write_text("contributor_name,contribution_receipt_date\nB,2024-02-01\n", encoding="utf-8")
+    combined = tmp_path / "c.csv"
+    monkeypatch.setattr(sys, "argv", ["fec-tools", "combine", "--input-dir", str(d), "--output", str(combined)])
+    main()
+    assert combined.exists()
+
+    out = tmp_path / "out.xlsx"
+    monkeypatch.setattr(sys, "argv", ["fec-tools", "format-xlsx", "--input-file", str(combined), "--output", str(out), "--contributor-name", "b"])
+    main()
+    assert out.exists()
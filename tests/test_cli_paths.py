@@ -34,3 +34,25 @@ def test_cli_combine_subcommand(tmp_path: Path):
     assert res.returncode == 0, res.stderr
     assert out.exists()
 
+
+def test_cli_combine_union_schema(tmp_path: Path):
+    d = tmp_path / "d"; d.mkdir()
+    (d / "a.csv").write_text("h1,h2\n1,2\n", encoding="utf-8")
+    (d / "b.csv").write_text("h2,h3\n3,4\n", encoding="utf-8")
+    out = tmp_path / "c.csv"
+    cmd = [sys.executable, "-m", "fec_formatter.cli", "combine", "--input-dir", str(d), "--output", str(out), "--union-schema"]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    assert res.returncode == 0, res.stderr
+    assert "Remapped 'a.csv': missing columns: h3" in res.stdout
+    assert out.read_text(encoding="utf-8").splitlines() == ["h1,h2,h3", "1,2,", ",3,4"]
+
+
+
+def test_cli_partition_subcommand(tmp_path: Path):
+    src = tmp_path / "in.csv"
+    src.write_text("contributor_state,x\nCA,1\nNY,2\nCA,3\n", encoding="utf-8")
+    out = tmp_path / "parts"
+    cmd = [sys.executable, "-m", "fec_formatter.cli", "partition", "--input-file", str(src), "--output-dir", str(out), "--by", "contributor_state"]
+    res = subprocess.run(cmd, capture_output=True, text=True)
+    assert res.returncode == 0, res.stderr
+    assert (out / "CA.csv").exists() and (out / "manifest.json").exists()
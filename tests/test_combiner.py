@@ -37,3 +37,49 @@ def test_combiner_mismatched_header_raises(tmp_path: Path):
         CSVCombinerService().combine(tmp_path, tmp_path / "combined.csv")
 
 
+
+def test_combiner_union_schema_projects_rows(tmp_path: Path):
+    d = tmp_path / "in"
+    _write_csv(d / "one.csv", ["a", "b"], [["1", "2"]])
+    _write_csv(d / "two.csv", ["b", "c", "a"], [["3", "4", "5"], ["6"]])
+    _write_csv(d / "three.csv", ["a", "b", "c"], [["7", "8", "9"]])
+
+    out = tmp_path / "combined.csv"
+    result = CSVCombinerService().combine(d, out, union_schema=True)
+
+    # Files are combined in sorted order: one, three, two
+    with out.open("r", encoding="utf-8", newline="") as f:
+        assert list(csv.reader(f)) == [
+            ["a", "b", "c"],
+            ["1", "2", ""],
+            ["7", "8", "9"],
+            ["5", "3", "4"],
+            ["", "6", ""],
+        ]
+    assert result.header_columns == 3
+    assert [(r.path.name, r.missing_columns, r.reordered) for r in result.remapped_files] == [
+        ("one.csv", ("c",), False),
+        ("two.csv", (), True),
+    ]
+
+
+def test_combiner_union_schema_resumes_from_checkpoint(tmp_path: Path):
+    d = tmp_path / "in"
+    _write_csv(d / "one.csv", ["a"], [[str(i)] for i in range(4)])
+    _write_csv(d / "two.csv", ["b", "a"], [[f"b{i}", str(i)] for i in range(4)])
+    expected = tmp_path / "expected.csv"
+    CSVCombinerService().combine(d, expected, union_schema=True)
+
+    class Crashing(CSVCombinerService):
+        def _iter_rows_with_offsets(self, file_path, start_offset):  # type: ignore[no-untyped-def]
+            for n, item in enumerate(super()._iter_rows_with_offsets(file_path, start_offset)):
+                if file_path.name == "two.csv" and n == 2:
+                    raise KeyboardInterrupt
+                yield item
+
+    out = tmp_path / "out.csv"
+    with pytest.raises(KeyboardInterrupt):
+        Crashing().combine(d, out, union_schema=True, checkpoint=True, checkpoint_every=1)
+    result = CSVCombinerService().combine(d, out, union_schema=True, resume=True)
+    assert result.rows_written == 8
+    assert out.read_bytes() == expected.read_bytes()
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter.cli import Args, run_format
+from fec_formatter.enrichment import EnrichmentError, MasterFileEnricher
+
+
+CM = (
+    "C00831107|KATIE PORTER FOR SENATE|TREAS|ST1||IRVINE|CA|92618|P|S|DEM|Q|||S4CA00001\n"
+    "C00030718|REALTORS PAC|TREAS|ST1||CHICAGO|IL|60611|B|Q|UNK|M|T|NAR|\n"
+)
+CN = (
+    "H0XX00001|SOMEONE, ELSE|REP|2024|TX|H|01|C|C|C99999999|||||\n"
+    "S4CA00001|PORTER, KATIE|DEM|2024|CA|S|00|C|C|C00831107|||IRVINE|CA|92618\n"
+)
+
+
+def _masters(tmp_path: Path) -> tuple[Path, Path]:
+    cm = tmp_path / "cm.txt"
+    cn = tmp_path / "cn.txt"
+    cm.write_text(CM, encoding="utf-8")
+    cn.write_text(CN, encoding="utf-8")
+    return cm, cn
+
+
+def test_lookup_joins_committee_and_candidate(tmp_path: Path):
+    cm, cn = _masters(tmp_path)
+    enricher = MasterFileEnricher.from_paths(cm, cn)
+    try:
+        assert enricher.columns == ["Committee Type", "Committee Party", "Candidate", "Candidate Party"]
+        name, extras = enricher.lookup("C00831107")
+        assert name == "KATIE PORTER FOR SENATE"
+        assert extras == ["Senate (S)", "DEM", "PORTER, KATIE (S4CA00001)", "DEM"]
+        assert enricher.lookup("C00030718")[1] == ["PAC - Qualified (Q)", "UNK", "", ""]
+        assert enricher.lookup("C99")[1] == ["", "", "", ""]
+
+        # Bulk rows have no committee_name; the master supplies it for Recipient
+        build = enricher.build_with(lambda header, row: [f" ({row[0]})".strip(), "x"])
+        assert build(["committee_id"], ["C00831107"])[0] == "KATIE PORTER FOR SENATE (C00831107)"
+    finally:
+        enricher.close()
+
+
+def test_run_format_adds_enrichment_columns(tmp_path: Path):
+    cm, cn = _masters(tmp_path)
+    src = tmp_path / "in.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["committee_name", "committee_id", "contributor_name", "contribution_receipt_date"])
+        w.writerow(["KATIE PORTER FOR SENATE", "C00831107", "DOE", "2024-01-01"])
+
+    out = tmp_path / "out.xlsx"
+    args = Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=out, committee_master=cm, candidate_master=cn)
+    run_format(args)
+    ws = load_workbook(out).active
+    assert [c.value for c in ws[1]][7:] == ["Committee Type", "Committee Party", "Candidate", "Candidate Party"]
+    assert ws.cell(row=2, column=10).value == "PORTER, KATIE (S4CA00001)"
+
+    with pytest.raises(SystemExit):
+        run_format(Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=out, candidate_master=cn))
+
+
+def test_unusable_master_is_a_cli_error(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    src = tmp_path / "in.csv"
+    src.write_text("committee_id,contributor_name\nC1,A\n", encoding="utf-8")
+
+    def args() -> Args:
+        return Args(
+            input_file=src, contributor_names=(), contributor_ids=(), output_path=tmp_path / "o.xlsx",
+            committee_master=tmp_path / "cm.txt", no_cache=True,
+        )
+
+    with pytest.raises(SystemExit, match=r"^\[ERROR\] "):
+        run_format(args())
+
+    def bad_layout(*_a, **_kw):  # type: ignore[no-untyped-def]
+        raise EnrichmentError("Column CMTE_ID missing from layout of cm.txt")
+
+    monkeypatch.setattr(MasterFileEnricher, "from_paths", bad_layout)
+    with pytest.raises(SystemExit, match=r"\[ERROR\] Column CMTE_ID missing"):
+        run_format(args())
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter.cli import Args, run_format, run_sample
+from fec_formatter.combiner import CSVCombinerService
+
+
+HEADER = ["committee_name", "committee_id", "contributor_name", "contribution_receipt_date", "image_number"]
+
+
+def _write_csv(path: Path, header: list[str], rows: list[list[str]]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def _values(path: Path):
+    return [[c.value for c in r] for r in load_workbook(path).active.iter_rows()]
+
+
+def _inputs(tmp_path: Path) -> Path:
+    d = tmp_path / "in"
+    for n in range(3):
+        rows = [["C", "C1", f"N{n}-{i}", f"2024-0{(i % 3) + 1}-01" if i % 5 else "", f"IMG{n}{i}"] for i in range(10)]
+        _write_csv(d / f"{n}.csv", HEADER, rows)
+    return d
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_fused_format_matches_combine_then_format(tmp_path: Path, workers: int):
+    d = _inputs(tmp_path)
+    combined = tmp_path / "combined.csv"
+    CSVCombinerService().combine(d, combined)
+    expected = tmp_path / "expected.xlsx"
+    run_format(Args(input_file=combined, contributor_names=(), contributor_ids=(), output_path=expected, no_cache=True))
+
+    out = tmp_path / "fused.xlsx"
+    args = Args(
+        input_file=Path(""),
+        contributor_names=(),
+        contributor_ids=(),
+        output_path=out,
+        no_cache=True,
+        input_dir=d,
+        workers=workers,
+    )
+    run_format(args)
+    assert _values(out) == _values(expected)
+
+
+def test_fused_format_rejects_mismatched_headers(tmp_path: Path):
+    a = tmp_path / "a.csv"
+    b = tmp_path / "b.csv"
+    _write_csv(a, HEADER, [])
+    _write_csv(b, ["x"], [])
+    args = Args(input_file=a, contributor_names=(), contributor_ids=(), output_path=tmp_path / "o.xlsx", input_files=(a, b))
+    with pytest.raises(SystemExit, match="Header mismatch"):
+        run_format(args)
+    args.sample = 5
+    with pytest.raises(SystemExit, match="single input"):
+        run_sample(args)
+
+
+def test_fused_format_formats_each_file_once(tmp_path: Path):
+    d = _inputs(tmp_path)
+    first = sorted(d.glob("*.csv"))[0]
+    expected = tmp_path / "expected.xlsx"
+    run_format(Args(input_file=Path(""), contributor_names=(), contributor_ids=(), output_path=expected, no_cache=True, input_dir=d))
+
+    out = tmp_path / "dup.xlsx"
+    args = Args(
+        input_file=Path(""),
+        contributor_names=(),
+        contributor_ids=(),
+        output_path=out,
+        no_cache=True,
+        input_files=(first, d / ".." / d.name / first.name),
+        input_dir=d,
+    )
+    run_format(args)
+    assert _values(out) == _values(expected)
+
+
+def test_parallel_format_loads_masters_only_in_workers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from fec_formatter.enrichment import MasterFileEnricher
+
+    d = _inputs(tmp_path)
+    cm = tmp_path / "cm.txt"
+    cm.write_text("C1|MASTER NAME|T|||C|CA|9|P|Q|DEM|Q|||\n", encoding="utf-8")
+    parent_loads: list = []
+    real = MasterFileEnricher.from_paths
+
+    def recording(*a, **kw):  # type: ignore[no-untyped-def]
+        parent_loads.append(a)
+        return real(*a, **kw)
+
+    monkeypatch.setattr(MasterFileEnricher, "from_paths", recording)
+    out = tmp_path / "o.xlsx"
+    args = Args(
+        input_file=Path(""), contributor_names=(), contributor_ids=(), output_path=out,
+        no_cache=True, input_dir=d, workers=2, committee_master=cm,
+    )
+    run_format(args)
+    # Worker processes record into their own copies of the list
+    assert parent_loads == []
+    assert _values(out)[0][-2:] == ["Committee Type", "Committee Party"]
+    assert _values(out)[1][-2:] == ["PAC - Qualified (Q)", "DEM"]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+import pytest
+
+from fec_formatter.partitioner import CSVPartitionError, CSVPartitionerService
+
+
+def _write_csv(path: Path, header: list[str], rows: list[list[str]]):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def _read_csv(path: Path) -> list[list[str]]:
+    with path.open("r", encoding="utf-8", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_partition_with_small_handle_pool(tmp_path: Path):
+    header = ["committee_id", "amount"]
+    rows = [[f"C{i % 7}", str(i)] for i in range(100)] + [["", "x"], ["A/B", "y"], ["A_B", "z"]]
+    src = tmp_path / "in.csv"
+    _write_csv(src, header, rows)
+
+    out = tmp_path / "parts"
+    result = CSVPartitionerService().partition(
+        src, out, "committee_id", max_open_files=2, flush_rows=3, max_buffered_rows=10
+    )
+    assert result.rows_written == 103
+    assert result.partitions["C3"] == 14
+    assert sum(result.partitions.values()) == 103
+
+    # Every partition file has one header and its rows in input order
+    c3 = _read_csv(result.files["C3"])
+    assert c3[0] == header
+    assert [r[1] for r in c3[1:]] == [str(i) for i in range(3, 100, 7)]
+    assert result.files[""].name == "_blank.csv"
+    assert result.files["A/B"] != result.files["A_B"]
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["partitions"]["C0"] == {"file": "C0.csv", "rows": 15}
+
+    with pytest.raises(CSVPartitionError):
+        CSVPartitionerService().partition(src, out, "committee_id")
+
+
+def test_partition_by_election_cycle(tmp_path: Path):
+    src = tmp_path / "in.csv"
+    _write_csv(src, ["contribution_receipt_date"], [["2023-05-01"], ["2024-12-31"], ["2025-01-02"], ["bad"]])
+    result = CSVPartitionerService().partition(src, tmp_path / "out", "election_cycle")
+    assert result.partitions == {"2024": 2, "2026": 1, "": 1}
+
+    with pytest.raises(CSVPartitionError):
+        CSVPartitionerService().partition(src, tmp_path / "out2", "committee_id")
+
+
+def test_partition_rejects_bad_arguments(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    from fec_formatter import cli
+
+    src = tmp_path / "in.csv"
+    _write_csv(src, ["contributor_state"], [["CA"]])
+    with pytest.raises(CSVPartitionError):
+        CSVPartitionerService().partition(src, tmp_path / "out", "contributor_state", max_open_files=-1)
+    assert not (tmp_path / "out").exists()
+
+    argv = ["fec-tools", "partition", "--input-file", str(tmp_path / "missing.csv"), "--output-dir", str(tmp_path / "o"), "--by", "x"]
+    monkeypatch.setattr("sys.argv", argv)
+    with pytest.raises(SystemExit, match=r"\[ERROR\] Input file not found"):
+        cli.main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import csv
+import io
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter import FilterSpec, FormatPipeline, PipelineError, open_source
+from fec_formatter.config import AppConfig, StyleConfig
+from fec_formatter.pipeline import build_rows, filter_rows, sort_rows, write_rows
+from fec_formatter.services import FECRowBuilder
+
+
+HEADER = ["committee_name", "committee_id", "contributor_name", "contributor_id", "contribution_receipt_date", "image_number", "pdf_url"]
+ROWS = [
+    ["C", "C1", "Realtors PAC", "X1", "2024-01-01", "IMG1", "http://1"],
+    ["C", "C1", "Someone Else", "X2", "2024-03-01", "IMG2", ""],
+    ["C", "C1", "Apartment Realtors", "X3", "", "IMG3", "http://3"],
+    ["C", "C1", "realtors assoc", "X4", "2024-02-01", "IMG4", "http://4"],
+]
+
+
+class _ListWriter:
+    def __init__(self) -> None:
+        self.rows: list = []
+
+    def write(self, rows_with_links, output_path) -> None:  # type: ignore[no-untyped-def]
+        self.rows.extend(rows_with_links)
+
+
+def test_stages_compose_over_iterable_rows():
+    builder = FECRowBuilder()
+    stream = open_source([HEADER, *ROWS, []])
+    predicate = builder.compile_filter(stream.header, [], [], ["realtors"])
+    typed = sort_rows(build_rows(filter_rows(stream.rows, predicate), stream.header, builder.build_row))
+    sink = _ListWriter()
+    assert write_rows(typed, sink, None) == 3
+    assert [values[6] for values, _link in sink.rows] == ["IMG4", "IMG1", "IMG3"]
+    assert sink.rows[0][1] == "http://4"
+
+
+def test_open_source_accepts_file_object_and_explicit_header():
+    buf = io.StringIO()
+    csv.writer(buf).writerows(ROWS)
+    buf.seek(0)
+    stream = open_source(buf, header=HEADER)
+    assert stream.header == HEADER
+    assert len(list(stream.rows)) == 4
+    with pytest.raises(PipelineError):
+        open_source([])
+
+
+def test_format_pipeline_in_memory_with_custom_config(tmp_path: Path):
+    src = tmp_path / "in.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        csv.writer(f).writerows([HEADER, *ROWS])
+
+    config = AppConfig(style=StyleConfig(base_font_name="Arial"))
+    pipeline = FormatPipeline.from_config(config, FilterSpec(ids=("x2",)))
+    out = io.BytesIO()
+    assert pipeline.run(src, out) == 1
+
+    out.seek(0)
+    ws = load_workbook(out).active
+    assert ws.cell(row=2, column=7).value == "IMG2"
+    assert ws.cell(row=2, column=1).font.name == "Arial"
+
+
+def test_compiled_filter_matches_matches_filters():
+    builder = FECRowBuilder()
+    predicate = builder.compile_filter(HEADER, ["someone  else"], [], ())
+    for row in ROWS:
+        assert predicate(row) == builder.matches_filters(row, HEADER, ["someone  else"], [], ())
+
+
+def test_format_pipeline_matches_run_format(tmp_path: Path):
+    from fec_formatter.cli import Args, run_format
+
+    header = ["committee_name", "committee_id", "contributor_name", "contributor_street_1", "contributor_city",
+              "contributor_state", "contributor_zip", "contribution_receipt_date", "image_number"]
+    src = tmp_path / "in.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerow(["C", "C1", "No Street", "", "SF", "CA", "94118", "2024-01-01", "IMG1"])
+        w.writerow(["C", "C1", "Has Street", "1 Main St", "SF", "CA", "94118", "2024-02-01", "IMG2"])
+        w.writerow(["C", "C1", "Zip Only", "", "", "", "94118", "", "IMG3"])
+
+    cli_out = tmp_path / "cli.xlsx"
+    run_format(Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=cli_out, no_cache=True))
+    api_out = tmp_path / "api.xlsx"
+    FormatPipeline().run(src, api_out)
+
+    def values(path: Path):
+        return [[c.value for c in r] for r in load_workbook(path).active.iter_rows()]
+
+    assert values(api_out) == values(cli_out)
+    assert [r[2] for r in values(api_out)[1:]] == ["1 Main St, SF, CA 94118", "SF, CA 94118", "94118"]
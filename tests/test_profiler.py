@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import csv
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from fec_formatter.cli import run_profile
+from fec_formatter.profiler import CSVProfilerService, DatasetProfile, HyperLogLog, QuantileSketch
+
+
+def test_hyperloglog_estimate_and_merge():
+    a, b = HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        a.add(f"id-{i}")
+    for i in range(10000, 30000):
+        b.add(f"id-{i}")
+    assert abs(a.estimate() - 20000) / 20000 < 0.03
+    a.merge(HyperLogLog.from_dict(b.to_dict()))
+    assert abs(a.estimate() - 30000) / 30000 < 0.03
+    small = HyperLogLog()
+    for v in ["x", "y", "x"]:
+        small.add(v)
+    assert small.estimate() == 2
+
+
+def test_quantile_sketch_relative_error_and_merge():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 2) for _ in range(5000)] + [0.0] * 50 + [-25.0] * 100
+    left, right = QuantileSketch(), QuantileSketch()
+    for i, v in enumerate(values):
+        (left if i % 2 else right).add(v)
+    left.merge(QuantileSketch.from_dict(right.to_dict()))
+    ordered = sorted(values)
+    for q in (0.01, 0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(left.quantile(q) - exact) <= 0.011 * abs(exact) + 1e-9
+    assert QuantileSketch().quantile(0.5) is None
+
+
+def _write(path: Path, header: list[str], rows: list[list[str]]):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def test_profile_merges_files_with_different_columns(tmp_path: Path):
+    one = tmp_path / "one.csv"
+    two = tmp_path / "two.csv"
+    _write(one, ["committee_id", "contribution_receipt_date", "contribution_receipt_amount"], [
+        ["C1", "2024-01-05", "100"],
+        ["C2", "not a date", "$1,000.50"],
+        ["C1", "", "abc"],
+    ])
+    _write(two, ["committee_id", "contributor_state"], [["C3", "CA"], ["", "NY"]])
+
+    profile = CSVProfilerService().profile([one, two])
+    summary = profile.summary()
+    assert summary["rows"] == 5
+    assert summary["distinct_estimates"]["committee_id"] == 3
+    assert summary["null_rates"]["committee_id"] == 0.2
+    assert summary["null_rates"]["contributor_state"] == 0.6
+    assert summary["null_rates"]["contribution_receipt_date"] == 0.6
+    assert summary["date_range"]["min"] == "2024-01-05T00:00:00"
+    assert summary["date_parse_failures"] == 1
+    assert summary["amount_parse_failures"] == 1
+    assert summary["amount"]["max"] == 1000.5
+
+    # Saved profiles merge to the same result as profiling everything at once
+    saved = tmp_path / "one.json"
+    run_profile([one], output=saved)
+    merged = run_profile([two], merge_files=[saved])
+    assert merged.summary() == DatasetProfile.from_dict(json.loads(json.dumps(profile.to_dict()))).summary()
+
+
+def test_profile_parallel_workers_match_serial(tmp_path: Path):
+    paths = []
+    for n in range(3):
+        p = tmp_path / f"{n}.csv"
+        _write(p, ["contributor_id", "contribution_receipt_amount"], [[f"X{n}-{i}", str(i)] for i in range(50)])
+        paths.append(p)
+    serial = CSVProfilerService().profile(paths).summary()
+    assert CSVProfilerService().profile(paths, workers=2).summary() == serial
+
+
+def test_run_profile_reports_bad_inputs(tmp_path: Path):
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+    with pytest.raises(SystemExit, match=r"^\[ERROR\] "):
+        run_profile([empty])
+
+    src = tmp_path / "in.csv"
+    src.write_text("a\n1\n", encoding="utf-8")
+    malformed = tmp_path / "bad.json"
+    malformed.write_text("{not json", encoding="utf-8")
+    not_profile = tmp_path / "other.json"
+    not_profile.write_text("{}", encoding="utf-8")
+    for merge in (malformed, not_profile):
+        with pytest.raises(SystemExit, match=r"^\[ERROR\] "):
+            run_profile([src], [merge])
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter.cli import Args, run_format
+from fec_formatter.combiner import CSVCombinerService
+from fec_formatter.readers import BulkLayout, iter_bulk_rows, iter_bulk_rows_with_offsets, read_bulk_header
+
+
+BULK_HEADER = (
+    "CMTE_ID,AMNDT_IND,RPT_TP,TRANSACTION_PGI,IMAGE_NUM,TRANSACTION_TP,ENTITY_TP,NAME,CITY,STATE,"
+    "ZIP_CODE,EMPLOYER,OCCUPATION,TRANSACTION_DT,TRANSACTION_AMT,OTHER_ID,TRAN_ID,FILE_NUM,MEMO_CD,MEMO_TEXT,SUB_ID\n"
+)
+LINES = [
+    "C00831107|N|Q1|P|202504159753351382|15|IND|DOE, JANE|SAN FRANCISCO|CA|94118|ACME|CEO|02122025|500||T1|1|||4001\n",
+    "C00831107|N|Q1|P||15|PAC|REALTORS PAC|CHICAGO|IL|60611|||03012025|5000|C00030718|T2|1|||4002\n",
+    "\n",
+    "C00000001|A|Q2|G|201|15|IND|SHORT ROW\n",
+]
+
+
+def _write_bulk(tmp_path: Path) -> tuple[Path, Path]:
+    header_file = tmp_path / "indiv_header_file.csv"
+    header_file.write_text(BULK_HEADER, encoding="utf-8")
+    data = tmp_path / "bulk" / "itcont.txt"
+    data.parent.mkdir()
+    data.write_text("".join(LINES), encoding="utf-8")
+    return header_file, data
+
+
+def test_bulk_layout_maps_to_export_fields(tmp_path: Path):
+    header_file, data = _write_bulk(tmp_path)
+    layout = BulkLayout(read_bulk_header(header_file))
+    rows = list(iter_bulk_rows(data, layout))
+    assert len(rows) == 3
+    first = dict(zip(layout.header, rows[0]))
+    assert first["committee_id"] == "C00831107"
+    assert first["contributor_name"] == "DOE, JANE"
+    assert first["contribution_receipt_date"] == "2025-02-12"
+    assert first["contribution_receipt_amount"] == "500"
+    assert first["pdf_url"].endswith("?202504159753351382")
+    assert dict(zip(layout.header, rows[1]))["pdf_url"] == ""
+    # Short rows are padded to the header width
+    assert len(rows[2]) == len(layout.header)
+
+    with_offsets = list(iter_bulk_rows_with_offsets(data, layout))
+    assert [r for r, _ in with_offsets] == rows
+    resumed = list(iter_bulk_rows_with_offsets(data, layout, with_offsets[0][1]))
+    assert [r for r, _ in resumed] == rows[1:]
+
+
+def test_combine_and_format_read_bulk_directly(tmp_path: Path):
+    header_file, data = _write_bulk(tmp_path)
+    layout = BulkLayout(read_bulk_header(header_file))
+
+    combined = tmp_path / "combined.csv"
+    result = CSVCombinerService().combine(data.parent, combined, pattern="*.txt", bulk_layout=layout)
+    assert result.rows_written == 3
+    with combined.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f))
+    assert header == layout.header
+
+    out = tmp_path / "out.xlsx"
+    args = Args(
+        input_file=data,
+        contributor_names=(),
+        contributor_ids=(),
+        output_path=out,
+        input_format="fec-bulk",
+        bulk_header_file=header_file,
+    )
+    run_format(args)
+    ws = load_workbook(out).active
+    # Reverse-chronological: the March contribution comes first
+    assert ws.cell(row=2, column=2).value == "REALTORS PAC (C00030718)"
+    assert ws.cell(row=3, column=7).hyperlink is not None
+
+
+def test_empty_bulk_header_is_a_cli_error(tmp_path: Path):
+    header_file = tmp_path / "header.csv"
+    header_file.write_text("", encoding="utf-8")
+    data = tmp_path / "itcont.txt"
+    data.write_text("C1|N\n", encoding="utf-8")
+    args = Args(
+        input_file=data, contributor_names=(), contributor_ids=(), output_path=tmp_path / "o.xlsx",
+        input_format="fec-bulk", bulk_header_file=header_file, no_cache=True,
+    )
+    with pytest.raises(SystemExit, match=r"\[ERROR\] Bulk header file is empty"):
+        run_format(args)
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import csv
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter.cli import Args, run_format, run_sample
+from fec_formatter.sampling import ReservoirSampler, sample_matching_rows
+
+
+def test_reservoir_is_roughly_uniform():
+    counts: Counter = Counter()
+    for trial in range(2000):
+        sampler: ReservoirSampler[int] = ReservoirSampler(5, random.Random(trial))
+        for i in range(50):
+            sampler.offer(i)
+        assert len(sampler.items) == 5
+        counts.update(sampler.items)
+    # Each item is expected 2000 * 5 / 50 = 200 times
+    assert min(counts[i] for i in range(50)) > 130
+    assert max(counts.values()) < 280
+
+
+def test_sample_counts_exactly_and_estimates_under_budget():
+    records = [([str(i), "yes" if i % 2 else "no"], (i + 1) * 10) for i in range(100)]
+    full = sample_matching_rows(records, lambda r: r[1] == "yes", 10, seed=1, total_bytes=1000)
+    assert full.complete
+    assert full.rows_matched == 50
+    assert full.estimated_matches == 50
+    assert all(r[1] == "yes" for r in full.rows)
+
+    partial = sample_matching_rows(records, lambda r: r[1] == "yes", 10, seed=1, total_bytes=1000, max_bytes=200)
+    assert not partial.complete
+    assert partial.bytes_read == 200
+    assert partial.rows_matched == 10
+    assert partial.estimated_matches == 50
+
+
+def test_run_sample_writes_preview(tmp_path: Path, capsys):
+    src = tmp_path / "in.csv"
+    with src.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["contributor_name", "contribution_receipt_date", "image_number"])
+        for i in range(200):
+            w.writerow([f"Realtors {i}" if i % 4 == 0 else f"Other {i}", f"2024-01-{(i % 28) + 1:02d}", f"IMG{i}"])
+
+    out = tmp_path / "sample.xlsx"
+    args = Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=out, sample=7, sample_seed=3)
+    setattr(args, "contributor_name_contains", ("realtors",))
+    result = run_sample(args)
+    assert result.rows_matched == 50
+    assert "7 sampled rows of 50 matching rows" in capsys.readouterr().out
+
+    ws = load_workbook(out).active
+    assert ws.max_row == 8
+    assert all(str(ws.cell(row=r, column=2).value).startswith("Realtors") for r in range(2, 9))
+
+
+def test_sample_options_require_sample(tmp_path: Path):
+    src = tmp_path / "in.csv"
+    src.write_text("contributor_name\nA\n", encoding="utf-8")
+    args = Args(input_file=src, contributor_names=(), contributor_ids=(), output_path=tmp_path / "o.xlsx", sample_max_bytes=10)
+    with pytest.raises(SystemExit, match=r"--sample-max-bytes can only be used with --sample"):
+        run_format(args)
+    assert not (tmp_path / "o.xlsx").exists()
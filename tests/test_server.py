@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import csv
+import http.client
+import io
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from openpyxl import load_workbook
+
+from fec_formatter.cli import _parse_datasets
+from fec_formatter.server import Dataset, DatasetRegistry, FECServer, ServeError
+
+
+HEADER = ["committee_name", "committee_id", "contributor_name", "contributor_id", "contribution_receipt_date", "image_number"]
+
+
+def _write_csv(path: Path, rows: list[list[str]]):
+    with path.open("w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(HEADER)
+        w.writerows(rows)
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    path = tmp_path / "data.csv"
+    _write_csv(path, [
+        ["C", "C1", "Smith, Ann", "I1", "2024-01-02", "IMG1"],
+        ["C", "C1", "Jones, Bob", "I2", "2024-03-04", "IMG2"],
+        ["C", "C1", "Smithers, Cy", "I3", "", "IMG3"],
+    ])
+    return path
+
+
+@pytest.fixture
+def server(dataset: Path):
+    srv = FECServer({"main": dataset}, port=0)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    yield srv
+    srv.shutdown()
+    thread.join()
+
+
+def _post(srv: FECServer, payload: dict):
+    req = urllib.request.Request(
+        f"{srv.address}/format", data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(req) as resp:
+        return resp.headers["Content-Type"], resp.read()
+
+
+def _get(srv: FECServer, path: str):
+    with urllib.request.urlopen(f"{srv.address}{path}") as resp:
+        return json.loads(resp.read())
+
+
+def test_format_json_uses_indexes_and_sorts(server: FECServer):
+    _, body = _post(server, {"dataset": "main", "contributor_ids": ["i2"], "contributor_name_contains": ["smith"], "format": "json"})
+    rows = json.loads(body)["rows"]
+    assert [r[0][1] for r in rows] == ["Jones, Bob (I2)", "Smith, Ann (I1)", "Smithers, Cy (I3)"]
+    _, body = _post(server, {"dataset": "main", "contributor_names": ["SMITH, ANN"], "format": "json"})
+    assert len(json.loads(body)["rows"]) == 1
+
+
+def test_format_xlsx_and_concurrent_requests(server: FECServer):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: _post(server, {"dataset": "main"}), range(16)))
+    content_type, body = results[0]
+    assert content_type.startswith("application/vnd.openxmlformats")
+    # Workbooks embed their creation time, so compare cell values rather than bytes
+    sheets = [[[c.value for c in r] for r in load_workbook(io.BytesIO(b)).active.iter_rows()] for _, b in results]
+    assert all(sheet == sheets[0] for sheet in sheets)
+    assert len(sheets[0]) == 4
+    stats = _get(server, "/stats")
+    assert stats["requests"] == 16
+    assert stats["rows_served"] == 48
+    assert stats["latency_ms"]["p50"] is not None
+
+
+def test_errors_are_reported(server: FECServer):
+    for payload, status in (({"dataset": "nope"}, 404), ({}, 400), ({"dataset": "main", "format": "pdf"}, 400), ({"dataset": "main", "contributor_ids": "x"}, 400)):
+        with pytest.raises(urllib.error.HTTPError) as exc:
+            _post(server, payload)
+        assert exc.value.code == status
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _get(server, "/missing")
+    assert exc.value.code == 404
+    assert _get(server, "/stats")["errors"] == 4
+
+
+def test_reloads_changed_dataset(server: FECServer, dataset: Path):
+    assert _get(server, "/datasets")["datasets"][0]["rows"] == 3
+    _write_csv(dataset, [["C", "C1", "New, Dee", "I9", "2024-05-06", "IMG9"]])
+    st = dataset.stat()
+    os.utime(dataset, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    _, body = _post(server, {"dataset": "main", "format": "json"})
+    assert [r[0][1] for r in json.loads(body)["rows"]] == ["New, Dee (I9)"]
+    assert _get(server, "/stats")["reloads"] == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_unix_socket(tmp_path: Path, dataset: Path):
+    sock_path = tmp_path / "fec.sock"
+    srv = FECServer({"main": dataset}, unix_socket=sock_path)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    try:
+        conn = http.client.HTTPConnection("localhost")
+        conn.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.sock.connect(str(sock_path))
+        conn.request("POST", "/format", body=json.dumps({"dataset": "main", "format": "json"}))
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert len(json.loads(resp.read())["rows"]) == 3
+        conn.close()
+        assert srv.address == f"unix:{sock_path}"
+    finally:
+        srv.shutdown()
+        thread.join()
+    assert not sock_path.exists()
+
+
+def test_parse_datasets(tmp_path: Path, dataset: Path):
+    assert _parse_datasets([str(dataset), f"other={dataset}"]) == {"data": dataset, "other": dataset}
+    with pytest.raises(SystemExit):
+        _parse_datasets([])
+    with pytest.raises(SystemExit):
+        _parse_datasets([str(tmp_path / "missing.csv")])
+    with pytest.raises(SystemExit):
+        _parse_datasets([f"a={dataset}", f"a={dataset}"])
+
+
+def test_non_object_body_and_missing_file_return_errors(server: FECServer, dataset: Path):
+    req = urllib.request.Request(f"{server.address}/format", data=b"[1]")
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(req)
+    assert exc.value.code == 400
+    assert "JSON object" in json.loads(exc.value.read())["error"]
+
+    dataset.unlink()
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _post(server, {"dataset": "main", "format": "json"})
+    assert exc.value.code == 503
+    assert "unavailable" in json.loads(exc.value.read())["error"]
+    assert "error" in _get(server, "/datasets")["datasets"][0]
+
+
+def test_reload_does_not_block_other_datasets(tmp_path: Path, dataset: Path, monkeypatch: pytest.MonkeyPatch):
+    other = tmp_path / "other.csv"
+    _write_csv(other, [["C", "C1", "Other, Al", "I5", "2024-01-01", "IMG5"]])
+    registry = DatasetRegistry({"main": dataset, "other": other})
+
+    real_load = Dataset.load
+    started, release = threading.Event(), threading.Event()
+
+    def slow_load(name, path):  # type: ignore[no-untyped-def]
+        if name == "main":
+            started.set()
+            assert release.wait(5)
+        return real_load(name, path)
+
+    monkeypatch.setattr(Dataset, "load", slow_load)
+    st = dataset.stat()
+    os.utime(dataset, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    reloading = threading.Thread(target=registry.get, args=("main",))
+    reloading.start()
+    try:
+        assert started.wait(5)
+        # Served while "main" is still being parsed
+        assert len(registry.get("other").rows) == 1
+    finally:
+        release.set()
+        reloading.join()
+    assert registry.reloads == 1
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+def test_unix_socket_refuses_to_replace_regular_file(dataset: Path):
+    with pytest.raises(ServeError):
+        FECServer({"main": dataset}, unix_socket=dataset)
+    assert dataset.read_text(encoding="utf-8").startswith("committee_name")